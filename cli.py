@@ -71,6 +71,25 @@ def init_db():
         raise
 
 
+@cli.command()
+@click.option('--days', type=int, required=True, help='Drop log partitions that ended more than N days ago')
+@click.confirmation_option(prompt='This permanently deletes old job/error/health logs. Continue?')
+def drop_log_partitions(days):
+    """Drop expired monthly log partitions"""
+    from src.database.database import drop_expired_partitions
+    
+    click.echo("=" * 80)
+    click.echo("Dropping Expired Log Partitions")
+    click.echo("=" * 80)
+    
+    try:
+        dropped = drop_expired_partitions(days)
+        click.echo(f"✓ Dropped {dropped} partitions")
+    except Exception as e:
+        click.echo(f"✗ Error: {e}", err=True)
+        raise
+
+
 @cli.command()
 def process_data():
     """Process JSON data and generate Excel"""
@@ -95,28 +114,30 @@ def process_data():
 @click.option('--headless/--no-headless', default=True, help='Run browser in headless mode')
 def test_browser(headless):
     """Test browser automation"""
-    from src.automation.browser_manager import BrowserManager
+    from src.automation.browser_manager import BrowserManager, BrowserPool
     
     async def test():
         click.echo("=" * 80)
         click.echo("Testing Browser")
         click.echo("=" * 80)
         
-        async with BrowserManager() as browser:
-            await browser.start(headless=headless)
-            
-            click.echo("✓ Browser started")
-            
-            # Test navigation
-            await browser.goto("https://stake.ac")
-            click.echo("✓ Navigation successful")
-            
-            # Take screenshot
-            screenshot_path = Path("./screenshots/test.png")
-            screenshot_path.parent.mkdir(parents=True, exist_ok=True)
-            await browser.screenshot(str(screenshot_path))
-            click.echo(f"✓ Screenshot saved: {screenshot_path}")
-        
+        try:
+            async with BrowserManager() as browser:
+                await browser.start(headless=headless)
+                
+                click.echo("✓ Browser started")
+                
+                # Test navigation
+                await browser.goto("https://stake.ac")
+                click.echo("✓ Navigation successful")
+                
+                # Take screenshot
+                screenshot_path = Path("./screenshots/test.jpg")
+                screenshot_path.parent.mkdir(parents=True, exist_ok=True)
+                await browser.screenshot(str(screenshot_path))
+                click.echo(f"✓ Screenshot saved: {screenshot_path}")
+        finally:
+            await BrowserPool.shutdown()
         click.echo("✓ Browser test complete")
     
     asyncio.run(test())
@@ -186,8 +186,9 @@ class StakeCLI:
         print("="*80)
         
         dependencies = {
-            'openpyxl': 'Excel generation',
+            'xlsxwriter': 'Excel generation',
             'pandas': 'Data processing',
+            'simdjson': 'JSON parsing',
             'faker': 'Synthetic data',
             'playwright': 'Browser automation',
             'pydantic': 'Configuration',
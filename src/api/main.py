@@ -1,5 +1,6 @@
 """FastAPI application - REST API for registration automation"""
 
+import asyncio
 import logging
 from typing import List, Optional
 from uuid import UUID
@@ -8,11 +9,23 @@ from datetime import datetime
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTask
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.config import settings
-from src.database.database import get_db, engine, Base, check_db_connection
-from src.database import crud
+from src.config import config, settings
+from src.database.database import (
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+    async_engine,
+    check_async_db_connection,
+    check_db_connection,
+    drop_expired_partitions,
+    engine,
+    get_async_db,
+    get_db,
+    init_db,
+    maintain_partitions,
+)
+from src.database import async_crud, crud
 from src.database.models import JobStatus
 from src.queue.job_queue import JobQueue
 from src.processors.pipeline import DataPipeline
@@ -43,6 +56,12 @@ app.add_middleware(
 # Initialize job queue
 job_queue = JobQueue()
 
+# Periodic database health check task (started on startup)
+db_health_task: Optional[asyncio.Task] = None
+
+# Periodic log partition maintenance task (started on startup)
+partition_task: Optional[asyncio.Task] = None
+
 
 # Pydantic models for API
 class JobCreate(BaseModel):
@@ -95,15 +114,42 @@ class HealthResponse(BaseModel):
     timestamp: datetime
 
 
+async def monitor_db_connection():
+    """
+    Check database health periodically (the pools no longer ping on checkout)
+    
+    A failed ping disposes that engine's pool, so stale connections are
+    replaced with fresh ones instead of failing the next requests.
+    """
+    while True:
+        await asyncio.sleep(config.monitoring.health_check_interval_seconds)
+        if not await asyncio.to_thread(check_db_connection):
+            await asyncio.to_thread(engine.dispose)
+        if not await check_async_db_connection():
+            await async_engine.dispose()
+
+
+async def maintain_partitions_periodically():
+    """Keep monthly log partitions created ahead; drop expired ones only if configured"""
+    while True:
+        await asyncio.sleep(PARTITION_MAINTENANCE_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(maintain_partitions)
+            retention_days = config.cleanup.drop_log_partitions_after_days
+            if retention_days:
+                await asyncio.to_thread(drop_expired_partitions, retention_days)
+        except Exception as e:
+            logger.error("Partition maintenance failed: %s", e)
+
+
 # Startup and shutdown events
 @app.on_event("startup")
 async def startup():
     """Initialize database and services on startup"""
     logger.info("Starting up application...")
     
-    # Create database tables
-    logger.info("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    # Create database tables (and time-series partitions)
+    init_db()
     
     # Check database connection
     if check_db_connection():
@@ -111,6 +157,10 @@ async def startup():
     else:
         logger.error("✗ Database connection failed")
     
+    global db_health_task, partition_task
+    db_health_task = asyncio.create_task(monitor_db_connection())
+    partition_task = asyncio.create_task(maintain_partitions_periodically())
+    
     logger.info("✓ Application startup complete")
 
 
@@ -118,6 +168,11 @@ async def startup():
 async def shutdown():
     """Cleanup on shutdown"""
     logger.info("Shutting down application...")
+    
+    if db_health_task:
+        db_health_task.cancel()
+    if partition_task:
+        partition_task.cancel()
 
 
 # API Endpoints
@@ -211,27 +266,25 @@ async def create_job(
 async def list_jobs(
     status: Optional[str] = None,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all jobs"""
     
+    status_enum = None
     if status:
         try:
             status_enum = JobStatus[status.upper()]
-            jobs = crud.get_jobs_by_status(db, status_enum, limit=limit)
         except KeyError:
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
-    else:
-        jobs = db.query(crud.Job).order_by(crud.Job.created_at.desc()).limit(limit).all()
     
-    return jobs
+    return await async_crud.get_jobs(db, limit=limit, status=status_enum)
 
 
 @app.get("/jobs/{job_id}", response_model=JobResponse, tags=["Jobs"])
-async def get_job(job_id: UUID, db: Session = Depends(get_db)):
+async def get_job(job_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Get a specific job"""
     
-    job = crud.get_job(db, job_id)
+    job = await async_crud.get_job(db, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -239,10 +292,10 @@ async def get_job(job_id: UUID, db: Session = Depends(get_db)):
 
 
 @app.delete("/jobs/{job_id}", tags=["Jobs"])
-async def cancel_job(job_id: UUID, db: Session = Depends(get_db)):
+async def cancel_job(job_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Cancel a job"""
     
-    job = crud.get_job(db, job_id)
+    job = await async_crud.get_job(db, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -251,20 +304,20 @@ async def cancel_job(job_id: UUID, db: Session = Depends(get_db)):
         job_queue.cancel_job(job.rq_job_id)
     
     # Update database
-    crud.update_job_status(db, job_id, JobStatus.FAILED, error_message="Cancelled by user")
+    await async_crud.update_job_status(db, job_id, JobStatus.FAILED, error_message="Cancelled by user")
     
     return {"message": "Job cancelled"}
 
 
 @app.get("/jobs/{job_id}/logs", tags=["Jobs"])
-async def get_job_logs(job_id: UUID, db: Session = Depends(get_db)):
+async def get_job_logs(job_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Get logs for a specific job"""
     
-    job = crud.get_job(db, job_id)
+    job = await async_crud.get_job(db, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    logs = crud.get_job_logs(db, job_id)
+    logs = await async_crud.get_job_logs(db, job_id)
     return logs
 
 
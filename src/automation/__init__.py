@@ -1,10 +1,11 @@
 """Automation package"""
 
-from src.automation.browser_manager import BrowserManager
+from src.automation.browser_manager import BrowserManager, BrowserPool
 from src.automation.registration_workflow import RegistrationWorkflow, run_single_registration
 
 __all__ = [
     "BrowserManager",
+    "BrowserPool",
     "RegistrationWorkflow",
     "run_single_registration",
 ]
@@ -1,129 +1,411 @@
 """Browser automation manager using Playwright"""
 
 import asyncio
+import gzip
 import logging
+import re
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Awaitable, Callable, Iterable, List, TypeVar
+from urllib.parse import urlparse
 from datetime import datetime
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+import aiofiles
+from playwright.async_api import async_playwright, Browser, BrowserContext, Frame, Locator, Page, Playwright, Route
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from src.config import config, settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+CHROMIUM_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+]
+
+# Screenshot format by file extension
+IMAGE_TYPES = {".png": "png", ".jpg": "jpeg", ".jpeg": "jpeg"}
+
+# Directories already created by this process (screenshots, HTML dumps)
+_ensured_dirs: set[str] = set()
+
+# Human-like timings used when config.browser.humanize is enabled (ms)
+HUMANIZE_TYPE_DELAY = 50
+HUMANIZE_CLICK_DELAY = 100
+
+# Third-party hosts that keep the network busy without affecting the flow
+BLOCKED_URL_PATTERNS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "connect.facebook",
+    "hotjar.com",
+    "sentry.io",
+    "intercom.io",
+    "intercomcdn.com",
+    "livechatinc.com",
+    "fonts.googleapis.com",
+    "fonts.gstatic.com",
+    "segment.io",
+    "mixpanel.com",
+    "amplitude.com",
+)
+
+# Any URL whose host contains one of BLOCKED_URL_PATTERNS; routing only these
+# keeps first-party requests (and the HTTP cache) off the Python route handler
+BLOCKED_URL_RE = re.compile(
+    r"^[a-z][a-z0-9+.-]*://[^/?#]*(?:" + "|".join(map(re.escape, BLOCKED_URL_PATTERNS)) + ")",
+    re.IGNORECASE,
+)
+
+# Resource types dropped when config.features.block_heavy_resources is enabled
+HEAVY_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+# Target site host; requests to it (and its subdomains) are never blocked
+ALLOWED_HOST = urlparse(config.workflow.target_url).hostname or ""
+
+
+def _is_allowed_host(host: str) -> bool:
+    """Whether host is the target site or one of its subdomains"""
+    return host == ALLOWED_HOST or host.endswith("." + ALLOWED_HOST)
+
+# Scroll until scrollHeight stops growing (lazy content), in a single round trip.
+# Called with the container element, or with no argument for the whole page.
+SCROLL_TO_BOTTOM_JS = """
+async (el) => {
+    el = el || document.scrollingElement;
+    let last = -1;
+    for (let i = 0; i < 20; i++) {
+        el.scrollTop = el.scrollHeight;
+        await new Promise(r => setTimeout(r, 100));
+        if (el.scrollHeight === last) return;
+        last = el.scrollHeight;
+    }
+}
+"""
+
+
+def _ensure_dir(directory: Path):
+    """Create directory once per process instead of on every write"""
+    key = str(directory)
+    if key not in _ensured_dirs:
+        directory.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(key)
+
+
+class BrowserPool:
+    """
+    Process-wide Playwright instance and Chromium browser
+
+    Launching Chromium costs several seconds, so the browser is started once
+    and kept warm; each BrowserManager only allocates its own context + page.
+    """
+    
+    _playwright: Optional[Playwright] = None
+    _browser: Optional[Browser] = None
+    _lock: Optional[asyncio.Lock] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    @classmethod
+    def _get_lock(cls) -> asyncio.Lock:
+        """Get the pool lock, resetting the pool if the event loop changed"""
+        loop = asyncio.get_running_loop()
+        if cls._loop is not loop:
+            # Playwright objects are bound to the loop that created them
+            if cls._browser is not None or cls._playwright is not None:
+                if cls._loop is not None and cls._loop.is_running():
+                    # Still alive on another thread: close them there
+                    asyncio.run_coroutine_threadsafe(
+                        cls._close(cls._browser, cls._playwright), cls._loop
+                    )
+                else:
+                    logger.warning(
+                        "Event loop changed before BrowserPool.shutdown(); "
+                        "the previous browser and Playwright driver are leaked"
+                    )
+            cls._loop = loop
+            cls._lock = asyncio.Lock()
+            cls._playwright = None
+            cls._browser = None
+        return cls._lock
+    
+    @classmethod
+    async def get_browser(cls, headless: bool = True, slow_mo: int = 0) -> Browser:
+        """Get the shared browser, launching it on first use"""
+        async with cls._get_lock():
+            if cls._browser is None or not cls._browser.is_connected():
+                if cls._playwright is None:
+                    cls._playwright = await async_playwright().start()
+                
+                if settings.cdp_endpoint:
+                    # Multiplex through a Chromium shared with other worker processes
+                    logger.info("Connecting to shared browser at %s...", settings.cdp_endpoint)
+                    cls._browser = await cls._playwright.chromium.connect_over_cdp(
+                        settings.cdp_endpoint
+                    )
+                    logger.info("✓ Connected to shared browser")
+                else:
+                    logger.info("Launching shared browser (headless=%s)...", headless)
+                    cls._browser = await cls._playwright.chromium.launch(
+                        headless=headless,
+                        slow_mo=slow_mo,
+                        args=CHROMIUM_ARGS,
+                    )
+                    logger.info("✓ Shared browser launched")
+            return cls._browser
+    
+    @classmethod
+    async def new_context(
+        cls,
+        headless: bool = True,
+        slow_mo: int = 0,
+        **context_options: Any
+    ) -> BrowserContext:
+        """Allocate a fresh context on the shared browser"""
+        browser = await cls.get_browser(headless=headless, slow_mo=slow_mo)
+        return await browser.new_context(**context_options)
+    
+    @classmethod
+    async def release_context(cls, context: BrowserContext):
+        """Close a context, leaving the shared browser running"""
+        await context.close()
+    
+    @staticmethod
+    async def _close(browser: Optional[Browser], playwright: Optional[Playwright]):
+        """Close a browser and stop its Playwright driver"""
+        if browser:
+            # For a CDP-connected browser this only disconnects; the
+            # shared Chromium keeps serving the other workers
+            await browser.close()
+        if playwright:
+            await playwright.stop()
+    
+    @classmethod
+    async def shutdown(cls):
+        """Close the shared browser and stop Playwright (call on process exit)"""
+        if cls._lock is None:
+            return
+        
+        async with cls._get_lock():
+            await cls._close(cls._browser, cls._playwright)
+            cls._browser = None
+            cls._playwright = None
+        
+        logger.info("✓ Shared browser shut down")
+
 
 class BrowserManager:
-    """Manage Playwright browser instances"""
+    """Manage a Playwright context and page on the shared browser"""
     
     def __init__(self):
-        self.playwright: Optional[Playwright] = None
-        self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         
+        # Locators keyed by selector, cleared on navigation
+        self._locators: Dict[str, Locator] = {}
+        
         # Configuration
         self.headless = settings.headless
         self.timeout = config.browser.timeout
         self.slow_mo = config.browser.slow_mo
         self.viewport = config.browser.viewport
+        self.type_delay = HUMANIZE_TYPE_DELAY if config.browser.humanize else 0
+        self.click_delay = HUMANIZE_CLICK_DELAY if config.browser.humanize else 0
     
     async def start(self, headless: Optional[bool] = None):
-        """Initialize Playwright and launch browser"""
+        """Allocate a browser context and page on the shared browser"""
         if headless is not None:
             self.headless = headless
         
-        logger.info(f"Starting browser (headless={self.headless})...")
+        logger.info("Starting browser context (headless=%s)...", self.headless)
         
         try:
-            self.playwright = await async_playwright().start()
-            
-            # Launch Chromium
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                slow_mo=self.slow_mo,
-                args=[
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-blink-features=AutomationControlled',
-                ]
-            )
-            
-            # Create context with options
-            self.context = await self.browser.new_context(
-                viewport=self.viewport,
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                locale='en-US',
-                timezone_id='Asia/Kolkata',
-            )
-            
-            # Set default timeout
-            self.context.set_default_timeout(self.timeout)
+            self.context = await self._new_context()
             
             # Create page
             self.page = await self.context.new_page()
+            self.page.on("framenavigated", self._on_frame_navigated)
             
-            # Enable console logging if configured
-            if config.features.enable_console_logging:
-                self.page.on("console", lambda msg: logger.debug(f"Browser console: {msg.text}"))
+            # Enable console logging if configured (skip the event traffic unless DEBUG is on)
+            if config.features.enable_console_logging and logger.isEnabledFor(logging.DEBUG):
+                self.page.on("console", lambda msg: logger.debug("Browser console: %s", msg.text))
             
             # Enable error logging
-            self.page.on("pageerror", lambda err: logger.error(f"Browser error: {err}"))
+            self.page.on("pageerror", lambda err: logger.error("Browser error: %s", err))
             
             logger.info("✓ Browser started successfully")
             
         except Exception as e:
-            logger.error(f"Failed to start browser: {e}")
+            logger.error("Failed to start browser: %s", e)
             await self.cleanup()
             raise
     
-    async def goto(self, url: str, wait_until: str = "networkidle") -> bool:
-        """Navigate to URL"""
+    async def _new_context(self) -> BrowserContext:
+        """Allocate a configured context on the shared browser"""
+        context = await BrowserPool.new_context(
+            headless=self.headless,
+            slow_mo=self.slow_mo,
+            viewport=self.viewport,
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            locale='en-US',
+            timezone_id='Asia/Kolkata',
+        )
+        
+        # Set default timeout
+        context.set_default_timeout(self.timeout)
+        
+        # Drop non-essential requests so networkidle fires sooner. Heavy
+        # resources are only known by resource type, which needs every
+        # request; third-party blocking alone routes just the blocked hosts.
+        if config.features.block_heavy_resources:
+            await context.route("**/*", self._route_filter)
+        elif config.features.block_third_party_requests:
+            await context.route(BLOCKED_URL_RE, self._abort_route)
+        
+        return context
+    
+    async def map(
+        self,
+        urls: Iterable[str],
+        handler: Callable[[Page, str], Awaitable[T]],
+        concurrency: int = 8
+    ) -> List[Any]:
+        """
+        Run handler(page, url) for each URL in parallel on the shared browser
+        
+        Each URL gets its own context + page (at most `concurrency` open at
+        once), independent of this manager's own page. Results are returned
+        in input order; a failed URL yields its exception instead of a result.
+        """
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def one(url: str) -> T:
+            async with sem:
+                context = await self._new_context()
+                try:
+                    page = await context.new_page()
+                    return await handler(page, url)
+                finally:
+                    await BrowserPool.release_context(context)
+        
+        return await asyncio.gather(*(one(url) for url in urls), return_exceptions=True)
+    
+    async def _abort_route(self, route: Route):
+        """Abort a request to a blocked third-party host (never the target site)"""
+        if _is_allowed_host(urlparse(route.request.url).hostname or ""):
+            await route.continue_()
+        else:
+            await route.abort()
+    
+    async def _route_filter(self, route: Route):
+        """Abort third-party trackers/widgets (and heavy resources if configured)"""
+        request = route.request
+        host = urlparse(request.url).hostname or ""
+        
+        if not _is_allowed_host(host):
+            if config.features.block_third_party_requests and any(
+                pattern in host for pattern in BLOCKED_URL_PATTERNS
+            ):
+                await route.abort()
+                return
+        
+        if config.features.block_heavy_resources and request.resource_type in HEAVY_RESOURCE_TYPES:
+            await route.abort()
+            return
+        
+        await route.continue_()
+    
+    def _on_frame_navigated(self, frame: Frame):
+        """Drop cached locators once the main frame navigates away"""
+        if frame == self.page.main_frame:
+            self._locators.clear()
+    
+    def _loc(self, selector: str) -> Locator:
+        """
+        Get the Locator for selector, built once per page
+        
+        Locators re-resolve lazily on each action, so they never go stale;
+        .first keeps comma/alternative selectors out of strict-mode errors.
+        """
+        locator = self._locators.get(selector)
+        if locator is None:
+            locator = self._locators[selector] = self.page.locator(selector).first
+        return locator
+    
+    async def goto(self, url: str, wait_until: str = "domcontentloaded") -> bool:
+        """Navigate to URL (pass wait_until="networkidle" to wait for quiescence)"""
+        self._locators.clear()
         try:
-            logger.info(f"Navigating to: {url}")
+            logger.info("Navigating to: %s", url)
             await self.page.goto(url, wait_until=wait_until)
             logger.info("✓ Page loaded")
             return True
         except PlaywrightTimeoutError:
-            logger.error(f"Timeout loading page: {url}")
+            logger.error("Timeout loading page: %s", url)
             return False
         except Exception as e:
-            logger.error(f"Error navigating to {url}: {e}")
+            logger.error("Error navigating to %s: %s", url, e)
             return False
     
-    async def screenshot(self, filepath: str, full_page: bool = True) -> bool:
-        """Take screenshot"""
+    async def screenshot(
+        self,
+        filepath: str,
+        full_page: bool = True,
+        fmt: str = "jpeg",
+        quality: int = 80,
+        clip: Optional[Dict[str, float]] = None
+    ) -> bool:
+        """
+        Take screenshot
+        
+        A .png/.jpg/.jpeg extension on filepath picks the format (use .png
+        for lossless archival captures); otherwise fmt is used. quality
+        only applies to JPEG. clip={"x", "y", "width", "height"} captures
+        just that region.
+        """
         try:
             screenshot_path = Path(filepath)
-            screenshot_path.parent.mkdir(parents=True, exist_ok=True)
+            _ensure_dir(screenshot_path.parent)
             
-            await self.page.screenshot(
-                path=str(screenshot_path),
-                full_page=full_page
-            )
-            logger.info(f"✓ Screenshot saved: {filepath}")
+            image_type = IMAGE_TYPES.get(screenshot_path.suffix.lower(), fmt)
+            options: Dict[str, Any] = {"type": image_type, "full_page": full_page}
+            if image_type == "jpeg":
+                options["quality"] = quality
+            if clip:
+                options["clip"] = clip
+            
+            await self.page.screenshot(path=str(screenshot_path), **options)
+            logger.info("✓ Screenshot saved: %s", filepath)
             return True
         except Exception as e:
-            logger.error(f"Error taking screenshot: {e}")
+            logger.error("Error taking screenshot: %s", e)
             return False
     
     async def save_html(self, filepath: str) -> bool:
-        """Save page HTML"""
+        """Save page HTML (gzip-compressed when filepath ends in .gz)"""
         try:
             html = await self.page.content()
             
             html_path = Path(filepath)
-            html_path.parent.mkdir(parents=True, exist_ok=True)
+            _ensure_dir(html_path.parent)
             
-            with open(html_path, 'w', encoding='utf-8') as f:
-                f.write(html)
+            if html_path.suffix == '.gz':
+                data = await asyncio.to_thread(gzip.compress, html.encode('utf-8'), 6)
+                async with aiofiles.open(html_path, 'wb') as f:
+                    await f.write(data)
+            else:
+                async with aiofiles.open(html_path, 'w', encoding='utf-8') as f:
+                    await f.write(html)
             
-            logger.info(f"✓ HTML saved: {filepath}")
+            logger.info("✓ HTML saved: %s", filepath)
             return True
         except Exception as e:
-            logger.error(f"Error saving HTML: {e}")
+            logger.error("Error saving HTML: %s", e)
             return False
     
     async def wait_for_selector(
@@ -141,72 +423,77 @@ class BrowserManager:
             )
             return True
         except PlaywrightTimeoutError:
-            logger.warning(f"Timeout waiting for selector: {selector}")
+            logger.warning("Timeout waiting for selector: %s", selector)
             return False
         except Exception as e:
-            logger.error(f"Error waiting for selector {selector}: {e}")
+            logger.error("Error waiting for selector %s: %s", selector, e)
             return False
     
-    async def fill_input(self, selector: str, value: str, delay: int = 50) -> bool:
-        """Fill input field with typing delay"""
+    async def fill_input(self, selector: str, value: str, delay: Optional[int] = None) -> bool:
+        """Fill input field (typed key by key when a delay is set)"""
+        if delay is None:
+            delay = self.type_delay
+        
         try:
-            await self.page.fill(selector, "")  # Clear first
-            await self.page.type(selector, value, delay=delay)
-            logger.debug(f"✓ Filled {selector}")
+            locator = self._loc(selector)
+            if delay:
+                await locator.fill("")  # Clear first
+                await locator.type(value, delay=delay)
+            else:
+                await locator.fill(value)
+            logger.debug("✓ Filled %s", selector)
             return True
         except Exception as e:
-            logger.error(f"Error filling {selector}: {e}")
+            logger.error("Error filling %s: %s", selector, e)
             return False
     
-    async def click(self, selector: str, delay: int = 100) -> bool:
+    async def click(self, selector: str, delay: Optional[int] = None) -> bool:
         """Click element"""
+        if delay is None:
+            delay = self.click_delay
+        
         try:
-            await self.page.click(selector)
-            await asyncio.sleep(delay / 1000)  # Small delay after click
-            logger.debug(f"✓ Clicked {selector}")
+            await self._loc(selector).click()
+            if delay:
+                await asyncio.sleep(delay / 1000)  # Small delay after click
+            logger.debug("✓ Clicked %s", selector)
             return True
         except Exception as e:
-            logger.error(f"Error clicking {selector}: {e}")
+            logger.error("Error clicking %s: %s", selector, e)
             return False
     
     async def scroll_to_bottom(self, container_selector: Optional[str] = None) -> bool:
         """Scroll to bottom of page or container"""
         try:
+            # Scroll container (or page) and wait only as long as content keeps loading
             if container_selector:
-                # Scroll specific container
-                await self.page.eval_on_selector(
-                    container_selector,
-                    "el => el.scrollTop = el.scrollHeight"
-                )
+                await self._loc(container_selector).evaluate(SCROLL_TO_BOTTOM_JS)
             else:
-                # Scroll page
-                await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            
-            await asyncio.sleep(1)  # Wait for scroll to complete
+                await self.page.evaluate(SCROLL_TO_BOTTOM_JS)
             logger.debug("✓ Scrolled to bottom")
             return True
         except Exception as e:
-            logger.error(f"Error scrolling: {e}")
+            logger.error("Error scrolling: %s", e)
             return False
     
     async def check_checkbox(self, selector: str) -> bool:
         """Check a checkbox"""
         try:
             await self.page.check(selector)
-            logger.debug(f"✓ Checked {selector}")
+            logger.debug("✓ Checked %s", selector)
             return True
         except Exception as e:
-            logger.error(f"Error checking {selector}: {e}")
+            logger.error("Error checking %s: %s", selector, e)
             return False
     
     async def select_option(self, selector: str, value: str) -> bool:
         """Select dropdown option"""
         try:
             await self.page.select_option(selector, value)
-            logger.debug(f"✓ Selected {value} in {selector}")
+            logger.debug("✓ Selected %s in %s", value, selector)
             return True
         except Exception as e:
-            logger.error(f"Error selecting option in {selector}: {e}")
+            logger.error("Error selecting option in %s: %s", selector, e)
             return False
     
     async def upload_file(self, selector: str, filepath: str) -> bool:
@@ -214,67 +501,78 @@ class BrowserManager:
         try:
             file_path = Path(filepath)
             if not file_path.exists():
-                logger.error(f"File not found: {filepath}")
+                logger.error("File not found: %s", filepath)
                 return False
             
             await self.page.set_input_files(selector, str(file_path))
-            logger.debug(f"✓ Uploaded {filepath}")
+            logger.debug("✓ Uploaded %s", filepath)
             return True
         except Exception as e:
-            logger.error(f"Error uploading file: {e}")
+            logger.error("Error uploading file: %s", e)
             return False
     
     async def wait_for_navigation(self, timeout: Optional[int] = None):
         """Wait for navigation"""
         try:
-            await self.page.wait_for_load_state("networkidle", timeout=timeout)
+            await self.page.wait_for_load_state("domcontentloaded", timeout=timeout)
             return True
         except Exception as e:
-            logger.error(f"Error waiting for navigation: {e}")
+            logger.error("Error waiting for navigation: %s", e)
+            return False
+    
+    async def network_idle_guard(self, threshold_ms: int = 500) -> bool:
+        """
+        Briefly wait for network idle before reading dynamic content
+        
+        Pages with background pollers may never go idle, so this gives up
+        after threshold_ms instead of failing the caller.
+        """
+        try:
+            await self.page.wait_for_load_state("networkidle", timeout=threshold_ms)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        except Exception as e:
+            logger.error("Error waiting for network idle: %s", e)
             return False
     
     async def get_text(self, selector: str) -> Optional[str]:
         """Get text content from element"""
         try:
-            element = await self.page.query_selector(selector)
-            if element:
-                return await element.text_content()
-            return None
+            locator = self._loc(selector)
+            # Don't auto-wait the full timeout for an element that isn't there
+            if not await locator.count():
+                return None
+            return await locator.text_content()
         except Exception as e:
-            logger.error(f"Error getting text from {selector}: {e}")
+            logger.error("Error getting text from %s: %s", selector, e)
             return None
     
     async def is_visible(self, selector: str) -> bool:
         """Check if element is visible"""
         try:
-            return await self.page.is_visible(selector)
+            return await self._loc(selector).is_visible()
         except Exception as e:
             return False
     
     async def cleanup(self):
-        """Clean up browser resources"""
+        """Close this manager's page and context (the shared browser stays warm)"""
         logger.info("Cleaning up browser resources...")
         
+        self._locators.clear()
+        
         try:
             if self.page:
                 await self.page.close()
                 self.page = None
             
             if self.context:
-                await self.context.close()
+                await BrowserPool.release_context(self.context)
                 self.context = None
             
-            if self.browser:
-                await self.browser.close()
-                self.browser = None
-            
-            if self.playwright:
-                await self.playwright.stop()
-                self.playwright = None
-            
             logger.info("✓ Browser cleanup complete")
         except Exception as e:
-            logger.error(f"Error during cleanup: {e}")
+            logger.error("Error during cleanup: %s", e)
     
     async def __aenter__(self):
         """Context manager entry"""
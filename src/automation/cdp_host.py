@@ -0,0 +1,82 @@
+"""Shared Chromium host for worker processes
+
+Launches a single Chromium with remote debugging enabled and prints its
+WebSocket endpoint. Point every worker at it with CDP_ENDPOINT so they
+connect over CDP instead of each launching their own browser.
+
+Usage:
+    python -m src.automation.cdp_host --port 9222
+
+The DevTools port is unauthenticated and gives full control of the browser,
+so it listens on 127.0.0.1 by default and the Chromium sandbox stays on
+(run the host as a non-root user). Only pass ``--address`` for a private,
+firewalled network; workers there use ``http://<host>:9222`` as the
+endpoint and Playwright resolves the WebSocket URL from it.
+"""
+
+import argparse
+import json
+import subprocess
+import time
+import urllib.request
+
+from playwright.sync_api import sync_playwright
+
+from src.automation.browser_manager import CHROMIUM_ARGS
+from src.config import settings
+
+# Flags from CHROMIUM_ARGS never given to the network-reachable shared browser
+SANDBOX_DISABLING_ARGS = frozenset({"--no-sandbox", "--disable-setuid-sandbox"})
+
+
+def get_chromium_executable() -> str:
+    """Get the path of Playwright's bundled Chromium"""
+    with sync_playwright() as p:
+        return p.chromium.executable_path
+
+
+def wait_for_endpoint(port: int, host: str = "127.0.0.1", timeout: float = 30.0) -> str:
+    """Poll the DevTools HTTP endpoint until the browser WebSocket URL is available"""
+    url = f"http://{host}:{port}/json/version"
+    deadline = time.monotonic() + timeout
+    
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                return json.load(response)["webSocketDebuggerUrl"]
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a shared Chromium for CDP clients")
+    parser.add_argument("--port", type=int, default=9222, help="Remote debugging port")
+    parser.add_argument("--address", default="127.0.0.1", help="Remote debugging address")
+    args = parser.parse_args()
+    
+    command = [
+        get_chromium_executable(),
+        f"--remote-debugging-port={args.port}",
+        f"--remote-debugging-address={args.address}",
+        *(arg for arg in CHROMIUM_ARGS if arg not in SANDBOX_DISABLING_ARGS),
+    ]
+    if settings.headless:
+        command.append("--headless=new")
+    command.append("about:blank")
+    
+    process = subprocess.Popen(command)
+    try:
+        poll_host = "127.0.0.1" if args.address == "0.0.0.0" else args.address
+        print(wait_for_endpoint(args.port, poll_host), flush=True)
+        process.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -57,6 +57,9 @@ class VerificationPage:
         logger.info("Extracting verification status...")
         
         try:
+            # Status is filled in asynchronously, let pending requests settle
+            await self.browser.network_idle_guard()
+            
             # Get text from status elements
             status_text = await self.browser.get_text(self.STATUS_TEXT)
             
@@ -123,7 +126,7 @@ class VerificationPage:
         screenshots_path = Path(screenshots_folder)
         screenshots_path.mkdir(parents=True, exist_ok=True)
         
-        screenshot_file = screenshots_path / f"{job_id}_verification.png"
+        screenshot_file = screenshots_path / f"{job_id}_verification.jpg"
         html_file = screenshots_path / f"{job_id}_verification.html"
         
         # Capture screenshot
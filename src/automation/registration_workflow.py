@@ -194,7 +194,7 @@ class RegistrationWorkflow:
             
             # Try to capture screenshot on error
             try:
-                error_screenshot = Path(config.paths.screenshots) / f"{job_id}_error.png"
+                error_screenshot = Path(config.paths.screenshots) / f"{job_id}_error.jpg"
                 await self.browser.screenshot(str(error_screenshot))
                 result["screenshot_path"] = str(error_screenshot)
             except:
@@ -1,10 +1,12 @@
 """Configuration management module"""
 
 import os
+import dataclasses
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -14,6 +16,7 @@ class BrowserConfig(BaseModel):
     timeout: int = 30000
     slow_mo: int = 0
     viewport: Dict[str, int] = {"width": 1920, "height": 1080}
+    humanize: bool = False  # Type with per-key delay and pause after clicks
 
 
 class PathsConfig(BaseModel):
@@ -56,6 +59,10 @@ class DatabaseConfig(BaseModel):
     name: str = "stake_db"
     pool_size: int = 10
     max_overflow: int = 20
+    pool_use_lifo: bool = True  # Reuse the warmest connection; idle overflow gets reaped
+    pool_pre_ping: bool = False  # Health is checked periodically by the API instead
+    pool_recycle_seconds: int = 1800
+    statement_timeout_ms: int = 30000  # Server-side guard against runaway queries
 
 
 class RedisConfig(BaseModel):
@@ -86,6 +93,7 @@ class CleanupConfig(BaseModel):
     archive_logs_after_days: int = 7
     delete_old_jobs_after_days: int = 30
     cleanup_cron: str = "0 2 * * *"
+    drop_log_partitions_after_days: Optional[int] = None  # Opt-in: drop old log partitions
 
 
 class APIConfig(BaseModel):
@@ -108,6 +116,17 @@ class WorkflowConfig(BaseModel):
     verification_url: str = "https://stake.ac/settings/verification"
 
 
+class FeaturesConfig(BaseModel):
+    """Feature flags"""
+    enable_captcha_detection: bool = True
+    enable_network_logging: bool = True
+    enable_console_logging: bool = True
+    enable_screenshots_on_error: bool = True
+    enable_html_dumps: bool = True
+    block_third_party_requests: bool = True  # Abort analytics/ads/chat widget requests
+    block_heavy_resources: bool = False  # Abort images, fonts and media
+
+
 class Config(BaseModel):
     """Main configuration model"""
     browser: BrowserConfig = Field(default_factory=BrowserConfig)
@@ -123,6 +142,7 @@ class Config(BaseModel):
     api: APIConfig = Field(default_factory=APIConfig)
     security: SecurityConfig = Field(default_factory=SecurityConfig)
     workflow: WorkflowConfig = Field(default_factory=WorkflowConfig)
+    features: FeaturesConfig = Field(default_factory=FeaturesConfig)
 
 
 class Settings(BaseSettings):
@@ -139,6 +159,7 @@ class Settings(BaseSettings):
     postgres_host: str = "postgres"
     postgres_port: int = 5432
     database_url: Optional[str] = None
+    async_database_url: Optional[str] = None  # Derived from database_url (asyncpg driver)
     
     # Redis
     redis_host: str = "redis"
@@ -161,6 +182,7 @@ class Settings(BaseSettings):
     # Browser
     headless: bool = True
     browser_timeout: int = 30000
+    cdp_endpoint: Optional[str] = None  # Shared Chromium (see src.automation.cdp_host)
     
     # Logging
     log_level: str = "INFO"
@@ -176,6 +198,50 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = False
         extra = 'ignore'  # Ignore extra environment variables
+        frozen = True
+    
+    @model_validator(mode="before")
+    @classmethod
+    def _derive_urls(cls, data: Any) -> Any:
+        """Build connection URLs that were not provided explicitly"""
+        if not isinstance(data, dict):
+            return data
+        data = dict(data)
+        
+        def value(name: str) -> Any:
+            return data.get(name, cls.model_fields[name].default)
+        
+        if not data.get("database_url"):
+            data["database_url"] = (
+                f"postgresql://{value('postgres_user')}:{value('postgres_password')}"
+                f"@{value('postgres_host')}:{value('postgres_port')}/{value('postgres_db')}"
+            )
+        
+        # asyncpg URL for the async engine
+        if not data.get("async_database_url"):
+            data["async_database_url"] = (
+                "postgresql+asyncpg://" + data["database_url"].split("://", 1)[1]
+            )
+        
+        if not data.get("redis_url"):
+            data["redis_url"] = (
+                f"redis://{value('redis_host')}:{value('redis_port')}/{value('redis_db')}"
+            )
+        return data
+
+
+# libyaml-backed loader when available (several times faster than SafeLoader)
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Frozen dataclass generated for each config model class
+_frozen_types: Dict[type, type] = {}
+
+
+@lru_cache(maxsize=8)
+def _read_yaml(config_path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a YAML file (cached until the file's mtime changes)"""
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
 
 
 def load_config(config_path: str = "config/config.yaml") -> Config:
@@ -186,28 +252,41 @@ def load_config(config_path: str = "config/config.yaml") -> Config:
         print(f"Warning: Config file {config_path} not found, using defaults")
         return Config()
     
-    with open(config_file, 'r') as f:
-        config_data = yaml.safe_load(f)
+    config_data = _read_yaml(str(config_file), config_file.stat().st_mtime)
     
     return Config(**config_data)
 
 
+def freeze_config(model: BaseModel) -> Any:
+    """
+    Snapshot a validated config tree into frozen, slotted dataclasses
+    
+    Attribute reads on plain dataclasses are much cheaper than on pydantic
+    models, which matters for values read on every browser action.
+    """
+    model_cls = type(model)
+    frozen_cls = _frozen_types.get(model_cls)
+    if frozen_cls is None:
+        frozen_cls = dataclasses.make_dataclass(
+            f"_{model_cls.__name__}",
+            list(model_cls.model_fields),
+            frozen=True,
+            slots=True,
+        )
+        _frozen_types[model_cls] = frozen_cls
+    
+    return frozen_cls(**{
+        name: freeze_config(value) if isinstance(value, BaseModel) else value
+        for name, value in model
+    })
+
+
+@lru_cache(maxsize=1)
 def load_settings() -> Settings:
-    """Load settings from environment variables"""
+    """Load settings from environment variables (parsed once per process)"""
     return Settings()
 
 
 # Global instances
-config = load_config()
+config = freeze_config(load_config())
 settings = load_settings()
-
-# Build database URL if not provided
-if not settings.database_url:
-    settings.database_url = (
-        f"postgresql://{settings.postgres_user}:{settings.postgres_password}"
-        f"@{settings.postgres_host}:{settings.postgres_port}/{settings.postgres_db}"
-    )
-
-# Build Redis URL if not provided
-if not settings.redis_url:
-    settings.redis_url = f"redis://{settings.redis_host}:{settings.redis_port}/{settings.redis_db}"
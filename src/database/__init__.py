@@ -13,10 +13,15 @@ from src.database.models import (
 from src.database.database import (
     engine,
     SessionLocal,
+    async_engine,
+    AsyncSessionLocal,
     init_db,
     get_db,
     get_db_context,
+    get_async_db,
+    get_async_db_context,
     check_db_connection,
+    check_async_db_connection,
 )
 
 __all__ = [
@@ -32,8 +37,13 @@ __all__ = [
     # Database
     "engine",
     "SessionLocal",
+    "async_engine",
+    "AsyncSessionLocal",
     "init_db",
     "get_db",
     "get_db_context",
+    "get_async_db",
+    "get_async_db_context",
     "check_db_connection",
+    "check_async_db_connection",
 ]
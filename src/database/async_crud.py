@@ -0,0 +1,72 @@
+"""
+Async CRUD operations for code running on an event loop
+
+Mirrors the job/log helpers in crud.py that the API uses, on an
+AsyncSession (asyncpg), so request handlers don't block the loop on
+Postgres round trips. Status transition rules are shared with crud.py via
+apply_job_status().
+"""
+
+from typing import List, Optional, Union
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import queries
+from src.database.crud import apply_job_status
+from src.database.models import Job, JobLog, JobStatus
+
+
+def _as_uuid(value: Union[UUID, str]) -> UUID:
+    """Coerce an id to UUID so asyncpg binds it natively instead of as text"""
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+# ==================== JOB CRUD ====================
+
+async def get_job(db: AsyncSession, job_id: Union[UUID, str]) -> Optional[Job]:
+    """Get job by ID (served from the session identity map when already loaded)"""
+    return await db.get(Job, _as_uuid(job_id))
+
+
+async def get_jobs(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    status: Optional[JobStatus] = None,
+) -> List[Job]:
+    """Get all jobs with optional filtering"""
+    if status is None:
+        result = await db.scalars(queries.recent_jobs, {"skip": skip, "limit": limit})
+    else:
+        result = await db.scalars(
+            queries.recent_jobs_by_status,
+            {"status": status, "skip": skip, "limit": limit},
+        )
+    return result.all()
+
+
+async def update_job_status(
+    db: AsyncSession,
+    job_id: UUID,
+    status: JobStatus,
+    error_message: Optional[str] = None,
+    last_error_step: Optional[str] = None,
+    autocommit: bool = True,
+) -> Optional[Job]:
+    """Update job status"""
+    job = await get_job(db, job_id)
+    if job:
+        apply_job_status(job, status, error_message, last_error_step)
+        if autocommit:
+            await db.commit()
+            await db.refresh(job)
+    return job
+
+
+# ==================== JOB LOG CRUD ====================
+
+async def get_job_logs(db: AsyncSession, job_id: UUID) -> List[JobLog]:
+    """Get all logs for a specific job"""
+    stmt = select(JobLog).where(JobLog.job_id == _as_uuid(job_id)).order_by(JobLog.timestamp)
+    return (await db.scalars(stmt)).all()
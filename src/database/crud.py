@@ -1,11 +1,20 @@
-"""CRUD operations for database models"""
+"""
+CRUD operations for database models
 
-from typing import List, Optional
+Create/update helpers commit by default. Pass autocommit=False to batch
+several writes into the caller's transaction (e.g. inside get_db_context(),
+which commits once on exit); in that case generated values such as .id are
+not populated until the session is flushed (db.flush()).
+"""
+
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import desc, and_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from src.database import queries
 from src.database.models import (
     Job, JobLog, SystemHealth, WorkerHeartbeat, ErrorLog,
     JobStatus, VerificationStatus
@@ -21,6 +30,7 @@ def create_job(
     email: Optional[str] = None,
     username: Optional[str] = None,
     name: Optional[str] = None,
+    autocommit: bool = True,
 ) -> Job:
     """Create a new job"""
     job = Job(
@@ -32,14 +42,15 @@ def create_job(
         status=JobStatus.PENDING,
     )
     db.add(job)
-    db.commit()
-    db.refresh(job)
+    if autocommit:
+        db.commit()
+        db.refresh(job)
     return job
 
 
 def get_job(db: Session, job_id: UUID) -> Optional[Job]:
-    """Get job by ID"""
-    return db.query(Job).filter(Job.id == job_id).first()
+    """Get job by ID (served from the session identity map when already loaded)"""
+    return db.get(Job, job_id)
 
 
 def get_jobs(
@@ -49,10 +60,26 @@ def get_jobs(
     status: Optional[JobStatus] = None,
 ) -> List[Job]:
     """Get all jobs with optional filtering"""
-    query = db.query(Job)
-    if status:
-        query = query.filter(Job.status == status)
-    return query.order_by(desc(Job.created_at)).offset(skip).limit(limit).all()
+    if status is None:
+        result = db.execute(queries.recent_jobs, {"skip": skip, "limit": limit})
+    else:
+        result = db.execute(
+            queries.recent_jobs_by_status,
+            {"status": status, "skip": skip, "limit": limit},
+        )
+    return result.scalars().all()
+
+
+def get_jobs_with_logs(
+    db: Session,
+    status: Optional[JobStatus] = None,
+    limit: int = 100,
+) -> List[Job]:
+    """Get jobs with their logs loaded (one extra IN query, not one per job)"""
+    stmt = select(Job).options(selectinload(Job.logs)).order_by(desc(Job.created_at)).limit(limit)
+    if status is not None:
+        stmt = stmt.where(Job.status == status)
+    return db.scalars(stmt).all()
 
 
 def update_job_status(
@@ -61,35 +88,47 @@ def update_job_status(
     status: JobStatus,
     error_message: Optional[str] = None,
     last_error_step: Optional[str] = None,
+    autocommit: bool = True,
 ) -> Optional[Job]:
     """Update job status"""
     job = get_job(db, job_id)
     if job:
-        job.status = status
-        if status == JobStatus.RUNNING and not job.started_at:
-            job.started_at = datetime.utcnow()
-        elif status in [JobStatus.COMPLETED, JobStatus.FAILED]:
-            job.completed_at = datetime.utcnow()
-        
-        if error_message:
-            job.error_message = error_message
-        if last_error_step:
-            job.last_error_step = last_error_step
-        
-        if status == JobStatus.RETRY:
-            job.retry_count += 1
-        
-        db.commit()
-        db.refresh(job)
+        apply_job_status(job, status, error_message, last_error_step)
+        if autocommit:
+            db.commit()
+            db.refresh(job)
     return job
 
 
+def apply_job_status(
+    job: Job,
+    status: JobStatus,
+    error_message: Optional[str] = None,
+    last_error_step: Optional[str] = None,
+):
+    """Apply a status transition to a loaded job (shared with async_crud)"""
+    job.status = status
+    if status == JobStatus.RUNNING and not job.started_at:
+        job.started_at = datetime.utcnow()
+    elif status in [JobStatus.COMPLETED, JobStatus.FAILED]:
+        job.completed_at = datetime.utcnow()
+    
+    if error_message:
+        job.error_message = error_message
+    if last_error_step:
+        job.last_error_step = last_error_step
+    
+    if status == JobStatus.RETRY:
+        job.retry_count += 1
+
+
 def update_job_verification(
     db: Session,
     job_id: UUID,
     verification_status: VerificationStatus,
     screenshot_path: Optional[str] = None,
     html_content: Optional[str] = None,
+    autocommit: bool = True,
 ) -> Optional[Job]:
     """Update job verification status"""
     job = get_job(db, job_id)
@@ -99,8 +138,9 @@ def update_job_verification(
             job.verification_screenshot = screenshot_path
         if html_content:
             job.verification_html = html_content
-        db.commit()
-        db.refresh(job)
+        if autocommit:
+            db.commit()
+            db.refresh(job)
     return job
 
 
@@ -116,7 +156,7 @@ def delete_job(db: Session, job_id: UUID) -> bool:
 
 def get_jobs_by_status(db: Session, status: JobStatus) -> List[Job]:
     """Get all jobs with a specific status"""
-    return db.query(Job).filter(Job.status == status).all()
+    return db.execute(queries.jobs_by_status, {"status": status}).scalars().all()
 
 
 def get_jobs_for_recovery(db: Session) -> List[Job]:
@@ -135,7 +175,8 @@ def create_job_log(
     step_number: Optional[int] = None,
     duration_ms: Optional[int] = None,
     error_message: Optional[str] = None,
-    metadata: Optional[str] = None,
+    extra_data: Optional[Dict[str, Any]] = None,
+    autocommit: bool = True,
 ) -> JobLog:
     """Create a job log entry"""
     log = JobLog(
@@ -146,14 +187,33 @@ def create_job_log(
         status=status,
         duration_ms=duration_ms,
         error_message=error_message,
-        metadata=metadata,
+        extra_data=extra_data,
     )
     db.add(log)
-    db.commit()
-    db.refresh(log)
+    if autocommit:
+        db.commit()
+        db.refresh(log)
     return log
 
 
+def bulk_create_job_logs(
+    db: Session,
+    job_id: UUID,
+    entries: List[dict],
+    autocommit: bool = True,
+) -> int:
+    """
+    Insert several job log entries in one statement
+    
+    Each entry holds JobLog column values (step_name, action, status, ...).
+    Returns the number of rows inserted.
+    """
+    count = JobLog.bulk_log(db, [{**entry, "job_id": job_id} for entry in entries])
+    if autocommit and count:
+        db.commit()
+    return count
+
+
 def get_job_logs(db: Session, job_id: UUID) -> List[JobLog]:
     """Get all logs for a specific job"""
     return db.query(JobLog).filter(JobLog.job_id == job_id).order_by(JobLog.timestamp).all()
@@ -161,7 +221,7 @@ def get_job_logs(db: Session, job_id: UUID) -> List[JobLog]:
 
 def get_recent_logs(db: Session, limit: int = 100) -> List[JobLog]:
     """Get recent logs across all jobs"""
-    return db.query(JobLog).order_by(desc(JobLog.timestamp)).limit(limit).all()
+    return db.execute(queries.recent_logs, {"limit": limit}).scalars().all()
 
 
 # ==================== SYSTEM HEALTH CRUD ====================
@@ -175,6 +235,7 @@ def create_system_health(
     active_jobs: int = 0,
     pending_jobs: int = 0,
     worker_status: Optional[str] = None,
+    autocommit: bool = True,
 ) -> SystemHealth:
     """Create system health snapshot"""
     health = SystemHealth(
@@ -187,8 +248,9 @@ def create_system_health(
         worker_status=worker_status,
     )
     db.add(health)
-    db.commit()
-    db.refresh(health)
+    if autocommit:
+        db.commit()
+        db.refresh(health)
     return health
 
 
@@ -211,25 +273,40 @@ def update_worker_heartbeat(
     db: Session,
     worker_name: str,
     current_job_id: Optional[UUID] = None,
-    metadata: Optional[str] = None,
+    extra_data: Optional[Dict[str, Any]] = None,
+    autocommit: bool = True,
 ) -> WorkerHeartbeat:
-    """Update worker heartbeat"""
-    heartbeat = WorkerHeartbeat(
+    """Update worker heartbeat (upserts the worker's single row)"""
+    stmt = pg_insert(WorkerHeartbeat).values(
         worker_name=worker_name,
+        status="ALIVE",
         current_job_id=current_job_id,
-        metadata=metadata,
+        extra_data=extra_data,
+        timestamp=datetime.utcnow(),
     )
-    db.add(heartbeat)
-    db.commit()
-    db.refresh(heartbeat)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[WorkerHeartbeat.worker_name],
+        set_={
+            "status": stmt.excluded.status,
+            "current_job_id": stmt.excluded.current_job_id,
+            "metadata": stmt.excluded.metadata,
+            "timestamp": stmt.excluded.timestamp,
+        },
+    )
+    heartbeat = db.scalars(
+        stmt.returning(WorkerHeartbeat),
+        execution_options={"populate_existing": True},
+    ).one()
+    if autocommit:
+        db.commit()
     return heartbeat
 
 
 def get_latest_worker_heartbeat(db: Session, worker_name: str) -> Optional[WorkerHeartbeat]:
-    """Get latest heartbeat for a worker"""
-    return db.query(WorkerHeartbeat).filter(
-        WorkerHeartbeat.worker_name == worker_name
-    ).order_by(desc(WorkerHeartbeat.timestamp)).first()
+    """Get latest heartbeat for a worker (unique lookup on worker_name)"""
+    return db.scalars(
+        select(WorkerHeartbeat).where(WorkerHeartbeat.worker_name == worker_name)
+    ).one_or_none()
 
 
 # ==================== ERROR LOG CRUD ====================
@@ -242,7 +319,8 @@ def create_error_log(
     function: Optional[str] = None,
     job_id: Optional[UUID] = None,
     stack_trace: Optional[str] = None,
-    metadata: Optional[str] = None,
+    extra_data: Optional[Dict[str, Any]] = None,
+    autocommit: bool = True,
 ) -> ErrorLog:
     """Create an error log entry"""
     error = ErrorLog(
@@ -252,17 +330,18 @@ def create_error_log(
         function=function,
         job_id=job_id,
         stack_trace=stack_trace,
-        metadata=metadata,
+        extra_data=extra_data,
     )
     db.add(error)
-    db.commit()
-    db.refresh(error)
+    if autocommit:
+        db.commit()
+        db.refresh(error)
     return error
 
 
 def get_recent_errors(db: Session, limit: int = 50) -> List[ErrorLog]:
     """Get recent error logs"""
-    return db.query(ErrorLog).order_by(desc(ErrorLog.timestamp)).limit(limit).all()
+    return db.execute(queries.recent_errors, {"limit": limit}).scalars().all()
 
 
 # Import timedelta for time calculations
@@ -1,41 +1,233 @@
 """Database initialization and connection management"""
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import NullPool
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta
+from typing import AsyncGenerator, Generator
 import logging
+import re
 
-from src.config import settings
+from src.config import config, settings
 from src.database.models import Base
 
 logger = logging.getLogger(__name__)
 
+# Prepared statements kept per asyncpg connection (server-side parse/plan reuse)
+STATEMENT_CACHE_SIZE = 1024
+
+# Monthly partitions created ahead of the current month for RANGE (timestamp) tables
+PARTITION_MONTHS_AHEAD = 2
+
+# How often the API re-runs maintain_partitions() (see src.api.main)
+PARTITION_MAINTENANCE_INTERVAL_SECONDS = 6 * 60 * 60
+
+# Name suffix of a monthly partition, e.g. job_logs_p2024_05
+MONTHLY_PARTITION_RE = re.compile(r"_p(\d{4})_(\d{2})$")
+
+# Pool settings shared by the sync and async engines
+POOL_OPTIONS = {
+    "pool_size": config.database.pool_size,
+    "max_overflow": config.database.max_overflow,
+    "pool_use_lifo": config.database.pool_use_lifo,
+    "pool_pre_ping": config.database.pool_pre_ping,
+    "pool_recycle": config.database.pool_recycle_seconds,
+    "pool_reset_on_return": "rollback",
+}
+
 # Create database engine
 engine = create_engine(
     settings.database_url,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,  # Enable connection health checks
+    **POOL_OPTIONS,
+    connect_args={"options": f"-c statement_timeout={config.database.statement_timeout_ms}"},
     echo=settings.debug,  # Log SQL queries in debug mode
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) for code running on an event loop, e.g. the API.
+# SQLAlchemy's own prepared statement cache is a URL option; asyncpg's is a
+# connect() argument.
+async_database_url = make_url(settings.async_database_url)
+async_database_url = async_database_url.update_query_dict({
+    "prepared_statement_cache_size": str(STATEMENT_CACHE_SIZE),
+    **async_database_url.query,
+})
+async_engine = create_async_engine(
+    async_database_url,
+    **POOL_OPTIONS,
+    connect_args={
+        "statement_cache_size": STATEMENT_CACHE_SIZE,
+        "server_settings": {"statement_timeout": str(config.database.statement_timeout_ms)},
+    },
+    echo=settings.debug,
+)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 
 def init_db():
     """Initialize database tables"""
     try:
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
+        migrate_worker_heartbeats()
+        maintain_partitions()
         logger.info("Database tables created successfully")
     except Exception as e:
-        logger.error(f"Error creating database tables: {e}")
+        logger.error("Error creating database tables: %s", e)
         raise
 
 
+# Brings an existing worker_heartbeats table (one row per beat) to one row per
+# worker: create_all() never adds indexes to a table that already exists, and
+# the heartbeat upsert's ON CONFLICT needs the unique index
+WORKER_HEARTBEAT_MIGRATION = (
+    "DELETE FROM worker_heartbeats a USING worker_heartbeats b "
+    "WHERE a.worker_name = b.worker_name AND a.id < b.id",
+    "DROP INDEX IF EXISTS ix_worker_hb_name_ts",
+    # timestamp is rewritten by every upsert; indexing it blocks HOT updates
+    "DROP INDEX IF EXISTS ix_worker_heartbeats_timestamp",
+    "DROP INDEX IF EXISTS idx_worker_heartbeats_timestamp",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_worker_heartbeats_worker_name "
+    "ON worker_heartbeats (worker_name)",
+)
+
+
+def migrate_worker_heartbeats():
+    """Deduplicate heartbeats (keeping each worker's latest row) and add the unique index"""
+    with engine.begin() as conn:
+        # Block concurrent heartbeats so no duplicate sneaks in between the steps
+        conn.execute(text("LOCK TABLE worker_heartbeats IN SHARE ROW EXCLUSIVE MODE"))
+        for statement in WORKER_HEARTBEAT_MIGRATION:
+            conn.execute(text(statement))
+
+
+def _month_start(value: datetime, offset: int = 0) -> datetime:
+    """First day of the month `offset` months after value's month"""
+    month = value.month - 1 + offset
+    return datetime(value.year + month // 12, month % 12 + 1, 1)
+
+
+def maintain_partitions():
+    """
+    Create upcoming monthly partitions for the time-series tables
+    
+    Each table partitioned by RANGE (timestamp) gets a DEFAULT partition
+    (so inserts never fail) and one partition per month up to
+    PARTITION_MONTHS_AHEAD. Runs at startup and then periodically, so a
+    month's partition exists before its rows arrive; once rows for a month
+    have landed in DEFAULT, that month can no longer be attached.
+    Never drops anything, see drop_expired_partitions().
+    
+    Tables created before partitioning was introduced are plain tables
+    (create_all does not convert them); they are skipped, with one warning
+    per process, until they are recreated.
+    """
+    now = datetime.utcnow()
+    
+    for table in _partitioned_tables():
+        statements = [f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"]
+        for offset in range(PARTITION_MONTHS_AHEAD + 1):
+            start, end = _month_start(now, offset), _month_start(now, offset + 1)
+            statements.append(
+                f"CREATE TABLE IF NOT EXISTS {table}_p{start:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+            )
+        
+        for statement in statements:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(statement))
+            except Exception as e:
+                # e.g. rows for that month already landed in the DEFAULT partition
+                logger.warning("Could not create partition for %s: %s", table, e)
+
+
+def drop_expired_partitions(retention_days: int) -> int:
+    """
+    Drop monthly log partitions that ended more than retention_days ago
+    
+    Destructive cleanup task, only run when explicitly requested (the
+    `drop-log-partitions` CLI command, or cleanup.drop_log_partitions_after_days
+    in config). Dropping a partition replaces bulk DELETEs and the WAL/vacuum
+    work they cause. Rows that landed in the DEFAULT partition have no
+    monthly partition to drop, so expired ones are deleted from it.
+    Returns the number of partitions dropped.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    dropped = 0
+    
+    for table in _partitioned_tables():
+        with engine.begin() as conn:
+            partitions = conn.execute(text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :table"
+            ), {"table": table}).scalars().all()
+            
+            for partition in partitions:
+                match = MONTHLY_PARTITION_RE.search(partition)
+                if match is None:
+                    continue
+                month = datetime(int(match.group(1)), int(match.group(2)), 1)
+                if _month_start(month, 1) <= cutoff:
+                    conn.execute(text(f"DROP TABLE IF EXISTS {partition}"))
+                    logger.info("Dropped expired partition %s", partition)
+                    dropped += 1
+            
+            purged = conn.execute(
+                text(f"DELETE FROM {table}_default WHERE timestamp < :cutoff"),
+                {"cutoff": cutoff},
+            ).rowcount
+            if purged:
+                logger.info("Deleted %s expired rows from %s_default", purged, table)
+    
+    return dropped
+
+
+# Declared-partitioned tables already reported as plain tables in the database
+_unpartitioned_warned: set[str] = set()
+
+
+def _partitioned_tables() -> list[str]:
+    """
+    Tables declared with postgresql_partition_by that are partitioned in the database
+    
+    A declared table that exists as a plain table (it predates partitioning)
+    is left out and reported once per process.
+    """
+    declared = [
+        table.name for table in Base.metadata.sorted_tables
+        if table.dialect_options["postgresql"]["partition_by"]
+    ]
+    with engine.connect() as conn:
+        partitioned = set(conn.execute(text(
+            "SELECT c.relname FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = ANY(:tables)"
+        ), {"tables": declared}).scalars())
+    
+    for table in declared:
+        if table not in partitioned and table not in _unpartitioned_warned:
+            _unpartitioned_warned.add(table)
+            logger.warning(
+                "%s is not a partitioned table (created before partitioning); "
+                "skipping partition maintenance until it is recreated", table
+            )
+    return [table for table in declared if table in partitioned]
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Get database session
@@ -70,12 +262,52 @@ def get_db_context() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get async database session
+    Usage in FastAPI:
+        @app.get("/endpoint")
+        async def endpoint(db: AsyncSession = Depends(get_async_db)):
+            ...
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@asynccontextmanager
+async def get_async_db_context() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get async database session as context manager
+    Usage:
+        async with get_async_db_context() as db:
+            await async_crud.get_job(db, job_id)
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
 def check_db_connection() -> bool:
     """Check if database connection is healthy"""
     try:
         with engine.connect() as conn:
-            conn.execute("SELECT 1")
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.error("Database connection check failed: %s", e)
+        return False
+
+
+async def check_async_db_connection() -> bool:
+    """Check if the async engine's database connection is healthy"""
+    try:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
-        logger.error(f"Database connection check failed: {e}")
+        logger.error("Async database connection check failed: %s", e)
         return False
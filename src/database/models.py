@@ -1,18 +1,51 @@
 """Database models for Stake By Me system"""
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Enum, Float, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Enum, Float, Boolean, Index, insert, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+import os
+import time
 import uuid
 
 Base = declarative_base()
 
 
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7): 48-bit Unix ms timestamp + random
+    
+    New keys sort after existing ones, so inserts append to the right edge
+    of the primary key / FK B-trees instead of touching random leaf pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # Version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+class BulkLogMixin:
+    """Single-statement bulk inserts for append-only log tables"""
+    
+    @classmethod
+    def bulk_log(cls, session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert rows (dicts of column attribute values) in one round trip
+        
+        Runs as an executemany of one INSERT, which SQLAlchemy batches into
+        multi-row VALUES pages (insertmanyvalues) instead of a unit-of-work
+        flush per object. The caller's session decides when to commit.
+        """
+        if not rows:
+            return 0
+        session.execute(insert(cls), rows)
+        return len(rows)
+
+
 class JobStatus(str, PyEnum):
     """Job status enumeration"""
     PENDING = "PENDING"
@@ -33,10 +66,16 @@ class VerificationStatus(str, PyEnum):
 
 
 class Job(Base):
-    """Job model for tracking registration jobs"""
+    """
+    Job model for tracking registration jobs
+    
+    Job.logs loads lazily (one SELECT per job). List views that touch
+    .logs should load them with selectinload(Job.logs), as
+    crud.get_jobs_with_logs() does.
+    """
     __tablename__ = "jobs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     json_filename = Column(String(255), nullable=False)
     excel_filename = Column(String(255))
     
@@ -46,11 +85,33 @@ class Job(Base):
     name = Column(String(255))
     
     # Job status
-    status = Column(Enum(JobStatus), default=JobStatus.PENDING, nullable=False)
+    # VARCHAR + CHECK rather than a Postgres ENUM type, so statuses can be
+    # added without ALTER TYPE
+    status = Column(
+        Enum(
+            JobStatus,
+            name="job_status",
+            native_enum=False,
+            create_constraint=True,
+            length=32,
+            validate_strings=True,
+        ),
+        default=JobStatus.PENDING,
+        nullable=False,
+    )
     retry_count = Column(Integer, default=0)
     
     # Verification
-    verification_status = Column(Enum(VerificationStatus))
+    verification_status = Column(
+        Enum(
+            VerificationStatus,
+            name="verification_status",
+            native_enum=False,
+            create_constraint=True,
+            length=32,
+            validate_strings=True,
+        )
+    )
     verification_screenshot = Column(String(512))
     verification_html = Column(Text)
     
@@ -64,7 +125,19 @@ class Job(Base):
     last_error_step = Column(String(100))
     
     # Relationship to logs
-    logs = relationship("JobLog", back_populates="job", cascade="all, delete-orphan")
+    logs = relationship(
+        "JobLog",
+        back_populates="job",
+        cascade="all, delete-orphan",
+        order_by="(JobLog.step_number, JobLog.timestamp)",
+    )
+    
+    __table_args__ = (
+        # Job listings filtered by status, newest first
+        Index("ix_jobs_status_created_at", status, created_at.desc()),
+        # Queue scan over pending jobs only
+        Index("ix_jobs_pending", created_at, postgresql_where=text("status = 'PENDING'")),
+    )
     
     def __repr__(self):
         return f"<Job {self.id} - {self.status}>"
@@ -77,7 +150,7 @@ class Job(Base):
         return None
 
 
-class JobLog(Base):
+class JobLog(BulkLogMixin, Base):
     """Job log model for tracking individual steps"""
     __tablename__ = "job_logs"
     
@@ -90,8 +163,9 @@ class JobLog(Base):
     action = Column(String(500), nullable=False)
     status = Column(String(50), nullable=False)  # SUCCESS, FAILED, RUNNING
     
-    # Timing
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Timing (part of the primary key: the table is partitioned by it).
+    # btree: get_recent_logs sorts by timestamp DESC LIMIT n, which BRIN cannot serve
+    timestamp = Column(DateTime, default=datetime.utcnow, primary_key=True, index=True)
     duration_ms = Column(Integer)
     
     # Error info
@@ -99,11 +173,21 @@ class JobLog(Base):
     stack_trace = Column(Text)
     
     # Additional context
-    metadata = Column(Text)  # JSON string for additional data
+    # ("metadata" is reserved on declarative classes, so the attribute is renamed)
+    extra_data = Column("metadata", JSONB)
     
     # Relationship
     job = relationship("Job", back_populates="logs")
     
+    __table_args__ = (
+        # Logs of a job in chronological order
+        Index("ix_joblogs_job_id_timestamp", job_id, timestamp),
+        # Steps of a job in order
+        Index("ix_job_logs_job_step", job_id, step_number),
+        # Monthly partitions, see database.maintain_partitions()
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+    
     def __repr__(self):
         return f"<JobLog {self.id} - {self.job_id} - {self.step_name}>"
 
@@ -113,7 +197,8 @@ class SystemHealth(Base):
     __tablename__ = "system_health"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # btree, not BRIN: get_latest_system_health sorts by timestamp DESC LIMIT 1
+    timestamp = Column(DateTime, default=datetime.utcnow, primary_key=True, index=True)
     
     # Resource metrics
     cpu_usage_percent = Column(Float)
@@ -140,6 +225,11 @@ class SystemHealth(Base):
     # Browser metrics
     active_browser_instances = Column(Integer, default=0)
     
+    __table_args__ = (
+        # Monthly partitions, see database.maintain_partitions()
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+    
     def __repr__(self):
         return f"<SystemHealth {self.timestamp} - CPU: {self.cpu_usage_percent}%>"
 
@@ -150,21 +240,28 @@ class WorkerHeartbeat(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     worker_name = Column(String(100), nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Rewritten by every beat and never searched on, so not indexed (keeps updates HOT)
+    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
     status = Column(String(50), default="ALIVE")
     current_job_id = Column(UUID(as_uuid=True))
-    metadata = Column(Text)  # JSON string for additional info
+    extra_data = Column("metadata", JSONB)
+    
+    __table_args__ = (
+        # One row per worker, upserted on every heartbeat
+        Index("uq_worker_heartbeats_worker_name", worker_name, unique=True),
+    )
     
     def __repr__(self):
         return f"<WorkerHeartbeat {self.worker_name} - {self.timestamp}>"
 
 
-class ErrorLog(Base):
+class ErrorLog(BulkLogMixin, Base):
     """Global error logging"""
     __tablename__ = "error_logs"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # btree: get_recent_errors sorts by timestamp DESC LIMIT n, which BRIN cannot serve
+    timestamp = Column(DateTime, default=datetime.utcnow, primary_key=True, index=True)
     
     # Error details
     level = Column(String(20), nullable=False)  # DEBUG, INFO, WARNING, ERROR, CRITICAL
@@ -177,7 +274,16 @@ class ErrorLog(Base):
     # Error content
     message = Column(Text, nullable=False)
     stack_trace = Column(Text)
-    metadata = Column(Text)  # JSON string
+    extra_data = Column("metadata", JSONB)
+    
+    __table_args__ = (
+        # Recent errors of a job
+        Index("ix_error_logs_job_time", job_id, timestamp.desc()),
+        # Server-side filtering on extra_data keys
+        Index("ix_error_logs_extra_gin", extra_data, postgresql_using="gin"),
+        # Monthly partitions, see database.maintain_partitions()
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
     
     def __repr__(self):
         return f"<ErrorLog {self.id} - {self.level} - {self.message[:50]}>"
@@ -0,0 +1,43 @@
+"""
+Pre-built read statements shared by crud and async_crud
+
+lambda_stmt caches statement construction and its compiled form, so hot
+read paths only bind parameters on each call.
+"""
+
+from sqlalchemy import bindparam, desc, lambda_stmt, select
+
+from src.database.models import Job, JobLog, ErrorLog
+
+
+# Jobs, newest first (params: skip, limit)
+recent_jobs = lambda_stmt(
+    lambda: select(Job)
+    .order_by(desc(Job.created_at))
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+# Jobs with a given status, newest first (params: status, skip, limit)
+recent_jobs_by_status = lambda_stmt(
+    lambda: select(Job)
+    .where(Job.status == bindparam("status"))
+    .order_by(desc(Job.created_at))
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
+# All jobs with a given status (params: status)
+jobs_by_status = lambda_stmt(
+    lambda: select(Job).where(Job.status == bindparam("status"))
+)
+
+# Latest job logs across all jobs (params: limit)
+recent_logs = lambda_stmt(
+    lambda: select(JobLog).order_by(desc(JobLog.timestamp)).limit(bindparam("limit"))
+)
+
+# Latest error logs (params: limit)
+recent_errors = lambda_stmt(
+    lambda: select(ErrorLog).order_by(desc(ErrorLog.timestamp)).limit(bindparam("limit"))
+)
@@ -1,10 +1,11 @@
 """Synthetic data generator for missing fields"""
 
 import random
-import string
 import logging
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timedelta
+from types import MappingProxyType
+import numpy as np
 from faker import Faker
 
 logger = logging.getLogger(__name__)
@@ -16,217 +17,284 @@ fake = Faker("en_IN")  # Indian English for realistic Indian data
 class DataGenerator:
     """Generate synthetic data for missing registration fields"""
     
+    # Password shared by all generated accounts
+    DEFAULT_PASSWORD = "99782@Md"
+    
+    # Character pools and lookup tables (built once, not per call)
+    _EMAIL_DOMAINS = ("gmail.com", "yahoo.com", "outlook.com", "protonmail.com")
+    _FIRST_DIGITS = ("6", "7", "8", "9")  # Indian mobile numbers
+    _PHONE_COUNTRIES = frozenset({"India", "IN", "Gujarat", "Maharashtra"})
+    # First PIN code digit by state (region)
+    _REGION_MAP = {
+        "Gujarat": "3",
+        "Maharashtra": "4",
+        "Karnataka": "5",
+        "Tamil Nadu": "6",
+        "Delhi": "1",
+    }
+    _REGIONS = tuple(_REGION_MAP.values())
+    # Number of email/username patterns
+    _PATTERN_COUNT = 4
+    
     def __init__(self):
         self.fake = fake
         
-        # Occupation data
-        self.industries = [
+        # Occupation data (read-only, so a shared instance is thread-safe)
+        self.industries = (
             "Technology", "Finance", "Healthcare", "Education", "Retail",
             "Manufacturing", "Consulting", "Real Estate", "Transportation",
             "Hospitality", "Construction", "Agriculture"
-        ]
+        )
         
-        self.fields = [
+        self.fields = (
             "Engineering", "Management", "Sales", "Marketing", "Operations",
             "Research", "Customer Service", "Human Resources", "Finance",
             "Administration", "Quality Assurance", "Business Development"
-        ]
+        )
         
-        self.experience_levels = [
+        self.experience_levels = (
             "0-2 years", "3-5 years", "6-10 years", "10+ years"
-        ]
+        )
         
         # Indian states and cities
-        self.states = [
+        self.states = (
             "Maharashtra", "Gujarat", "Karnataka", "Tamil Nadu", "Delhi",
             "West Bengal", "Rajasthan", "Uttar Pradesh", "Kerala", "Punjab"
-        ]
+        )
         
-        self.cities_by_state = {
-            "Gujarat": ["Ahmedabad", "Surat", "Vadodara", "Rajkot", "Bhavnagar", "Jamnagar"],
-            "Maharashtra": ["Mumbai", "Pune", "Nagpur", "Nashik", "Aurangabad"],
-            "Karnataka": ["Bangalore", "Mysore", "Mangalore", "Hubli"],
-            "Tamil Nadu": ["Chennai", "Coimbatore", "Madurai", "Salem"],
-            "Delhi": ["New Delhi", "South Delhi", "North Delhi"],
-        }
+        self.cities_by_state = MappingProxyType({
+            "Gujarat": ("Ahmedabad", "Surat", "Vadodara", "Rajkot", "Bhavnagar", "Jamnagar"),
+            "Maharashtra": ("Mumbai", "Pune", "Nagpur", "Nashik", "Aurangabad"),
+            "Karnataka": ("Bangalore", "Mysore", "Mangalore", "Hubli"),
+            "Tamil Nadu": ("Chennai", "Coimbatore", "Madurai", "Salem"),
+            "Delhi": ("New Delhi", "South Delhi", "North Delhi"),
+        })
+    
+    # Every random choice below goes through draw(), a uniform float in [0, 1).
+    # Single records use random.random; fill_missing_fields_batch feeds a
+    # NumPy vector drawn once per batch, so both paths share the same rules.
     
-    def generate_email(self, firstname: Optional[str] = None, lastname: Optional[str] = None) -> str:
+    @staticmethod
+    def _pick(options, draw: Callable[[], float]):
+        """Pick one of options"""
+        return options[int(draw() * len(options))]
+    
+    @staticmethod
+    def _randint(low: int, high: int, draw: Callable[[], float]) -> int:
+        """Random integer in [low, high]"""
+        return low + int(draw() * (high - low + 1))
+    
+    def generate_email(
+        self,
+        firstname: Optional[str] = None,
+        lastname: Optional[str] = None,
+        draw: Callable[[], float] = random.random,
+    ) -> str:
         """Generate email address"""
         if firstname and lastname:
             # Create email from name
             first = firstname.lower().replace(" ", "")
             last = lastname.lower().replace(" ", "")
-            number = random.randint(1, 999)
+            domain = self._pick(self._EMAIL_DOMAINS, draw)
             
-            domains = ["gmail.com", "yahoo.com", "outlook.com", "protonmail.com"]
-            domain = random.choice(domains)
-            
-            patterns = [
-                f"{first}.{last}@{domain}",
-                f"{first}{last}@{domain}",
-                f"{first}.{last}{number}@{domain}",
-                f"{first}{number}@{domain}",
-            ]
-            return random.choice(patterns)
+            # Pick the pattern first so only the chosen string is built
+            pattern = int(draw() * self._PATTERN_COUNT)
+            if pattern == 0:
+                return f"{first}.{last}@{domain}"
+            if pattern == 1:
+                return f"{first}{last}@{domain}"
+            number = self._randint(1, 999, draw)
+            if pattern == 2:
+                return f"{first}.{last}{number}@{domain}"
+            return f"{first}{number}@{domain}"
         else:
             return self.fake.email()
     
-    def generate_username(self, firstname: Optional[str] = None, lastname: Optional[str] = None) -> str:
+    def generate_username(
+        self,
+        firstname: Optional[str] = None,
+        lastname: Optional[str] = None,
+        draw: Callable[[], float] = random.random,
+    ) -> str:
         """Generate username"""
         if firstname and lastname:
             first = firstname.lower().replace(" ", "")[:8]
             last = lastname.lower().replace(" ", "")[:8]
-            number = random.randint(10, 9999)
-            
-            patterns = [
-                f"{first}_{last}",
-                f"{first}{last}",
-                f"{first}_{number}",
-                f"{first}{last}{number}",
-            ]
-            return random.choice(patterns)
+            # Pick the pattern first so only the chosen string is built
+            pattern = int(draw() * self._PATTERN_COUNT)
+            if pattern == 0:
+                return f"{first}_{last}"
+            if pattern == 1:
+                return f"{first}{last}"
+            number = self._randint(10, 9999, draw)
+            if pattern == 2:
+                return f"{first}_{number}"
+            return f"{first}{last}{number}"
         else:
             return self.fake.user_name()
     
     def generate_password(self, length: int = 12) -> str:
         """Generate fixed password for all users"""
-        return "99782@Md"
+        return self.DEFAULT_PASSWORD
     
-    def generate_date_of_birth(self, min_age: int = 18, max_age: int = 80) -> str:
+    def generate_date_of_birth(
+        self,
+        min_age: int = 18,
+        max_age: int = 80,
+        draw: Callable[[], float] = random.random,
+    ) -> str:
         """Generate date of birth (YYYY-MM-DD format)"""
-        today = datetime.now()
-        start_date = today - timedelta(days=max_age * 365)
-        end_date = today - timedelta(days=min_age * 365)
-        
-        dob = self.fake.date_between(start_date=start_date, end_date=end_date)
+        latest = datetime.now().date() - timedelta(days=min_age * 365)
+        dob = latest - timedelta(days=self._randint(0, (max_age - min_age) * 365, draw))
         return dob.strftime("%Y-%m-%d")
     
-    def generate_phone_number(self, country: str = "India") -> str:
+    def generate_phone_number(
+        self,
+        country: str = "India",
+        draw: Callable[[], float] = random.random,
+    ) -> str:
         """Generate phone number"""
         # Indian mobile number format: +91XXXXXXXXXX
-        if country in ["India", "IN", "Gujarat", "Maharashtra"]:
+        if country in self._PHONE_COUNTRIES:
             # Start with 6, 7, 8, or 9
-            first_digit = random.choice(['6', '7', '8', '9'])
-            remaining = ''.join(random.choices(string.digits, k=9))
+            first_digit = self._pick(self._FIRST_DIGITS, draw)
+            remaining = f"{self._randint(0, 10**9 - 1, draw):09d}"
             return f"91{first_digit}{remaining}"
         else:
             return self.fake.phone_number()
     
-    def generate_address(self, city: Optional[str] = None, state: Optional[str] = None) -> str:
+    def generate_address(
+        self,
+        city: Optional[str] = None,
+        state: Optional[str] = None,
+        draw: Callable[[], float] = random.random,
+    ) -> str:
         """Generate residential address"""
         if not city or not state:
-            state = random.choice(self.states)
-            cities = self.cities_by_state.get(state, ["Unknown City"])
-            city = random.choice(cities)
+            state = self._pick(self.states, draw)
+            cities = self.cities_by_state.get(state, ("Unknown City",))
+            city = self._pick(cities, draw)
         
-        house_no = f"H.No. {random.randint(1, 999)}"
+        house_no = f"H.No. {self._randint(1, 999, draw)}"
         street = self.fake.street_name()
         
         return f"{house_no}, {street}, {city}, {state}"
     
-    def generate_postal_code(self, state: Optional[str] = None) -> str:
+    def generate_postal_code(
+        self,
+        state: Optional[str] = None,
+        draw: Callable[[], float] = random.random,
+    ) -> str:
         """Generate postal code (PIN code for India)"""
         # Indian PIN codes are 6 digits
         # First digit typically represents region
-        region_map = {
-            "Gujarat": "3",
-            "Maharashtra": "4",
-            "Karnataka": "5",
-            "Tamil Nadu": "6",
-            "Delhi": "1",
-        }
-        
-        first_digit = region_map.get(state, random.choice(list(region_map.values())))
-        remaining = ''.join(random.choices(string.digits, k=5))
+        first_digit = self._REGION_MAP.get(state) or self._pick(self._REGIONS, draw)
+        remaining = f"{self._randint(0, 10**5 - 1, draw):05d}"
         
         return f"{first_digit}{remaining}"
     
-    def generate_occupation_industry(self) -> str:
+    def generate_occupation_industry(self, draw: Callable[[], float] = random.random) -> str:
         """Generate occupation industry"""
-        return random.choice(self.industries)
+        return self._pick(self.industries, draw)
     
-    def generate_occupation_field(self) -> str:
+    def generate_occupation_field(self, draw: Callable[[], float] = random.random) -> str:
         """Generate occupation field"""
-        return random.choice(self.fields)
+        return self._pick(self.fields, draw)
     
-    def generate_occupation_experience(self) -> str:
+    def generate_occupation_experience(self, draw: Callable[[], float] = random.random) -> str:
         """Generate occupation experience"""
-        return random.choice(self.experience_levels)
+        return self._pick(self.experience_levels, draw)
     
-    def generate_city(self, state: Optional[str] = None) -> str:
+    def generate_city(
+        self,
+        state: Optional[str] = None,
+        draw: Callable[[], float] = random.random,
+    ) -> str:
         """Generate city name"""
         if state and state in self.cities_by_state:
-            return random.choice(self.cities_by_state[state])
+            return self._pick(self.cities_by_state[state], draw)
         return self.fake.city()
     
-    def generate_place_of_birth(self, state: Optional[str] = None) -> str:
+    def generate_place_of_birth(
+        self,
+        state: Optional[str] = None,
+        draw: Callable[[], float] = random.random,
+    ) -> str:
         """Generate place of birth"""
-        return self.generate_city(state) if state else self.fake.city()
+        return self.generate_city(state, draw) if state else self.fake.city()
+    
+    # Generator per required field, in fill order. Each takes (self, record,
+    # state, draw) and reads names/city from the original record for consistency.
+    _FIELD_GENERATORS = {
+        "email": lambda self, r, state, draw: self.generate_email(r.get("firstname"), r.get("lastname"), draw),
+        "username": lambda self, r, state, draw: self.generate_username(r.get("firstname"), r.get("lastname"), draw),
+        "password": lambda self, r, state, draw: self.generate_password(),
+        "dateofbirth": lambda self, r, state, draw: self.generate_date_of_birth(draw=draw),
+        "phonenumber": lambda self, r, state, draw: self.generate_phone_number(draw=draw),
+        "firstname": lambda self, r, state, draw: self.fake.first_name(),
+        "lastname": lambda self, r, state, draw: self.fake.last_name(),
+        "country": lambda self, r, state, draw: "India",
+        "place_of_birth": lambda self, r, state, draw: self.generate_place_of_birth(state, draw),
+        "residential_address": lambda self, r, state, draw: self.generate_address(r.get("city"), state, draw),
+        "city": lambda self, r, state, draw: self.generate_city(state, draw),
+        "postal_code": lambda self, r, state, draw: self.generate_postal_code(state, draw),
+        "occupation_industry": lambda self, r, state, draw: self.generate_occupation_industry(draw),
+        "occupation_field": lambda self, r, state, draw: self.generate_occupation_field(draw),
+        "occupation_experience": lambda self, r, state, draw: self.generate_occupation_experience(draw),
+    }
+    _REQ = frozenset(_FIELD_GENERATORS)
+    # Upper bound on draw() calls for one fully empty record (email 3,
+    # username 2, dateofbirth 1, phonenumber 2, place_of_birth 1, address 3,
+    # city 1, postal_code 2, occupation 3)
+    _MAX_DRAWS = 18
     
-    def fill_missing_fields(self, record: Dict) -> Dict:
+    def _missing_fields(self, record: Dict) -> set:
+        """Required fields that are absent or empty in record"""
+        missing = self._REQ - record.keys()
+        missing.update(key for key in self._REQ & record.keys() if not record[key])
+        return missing
+    
+    def fill_missing_fields(
+        self,
+        record: Dict,
+        draw: Callable[[], float] = random.random,
+    ) -> Dict:
         """
         Fill in missing fields with generated data
         Maintains consistency (e.g., state-city-postal code)
+        
+        A record with every required field set is returned as is (not copied).
         """
-        filled = record.copy()
+        missing = self._missing_fields(record)
+        if not missing:
+            return record
         
         # Get existing values for consistency
-        state = filled.get("state") or filled.get("country") or "Gujarat"
-        city = filled.get("city")
-        firstname = filled.get("firstname")
-        lastname = filled.get("lastname")
-        
-        # Generate missing fields
-        if not filled.get("email"):
-            filled["email"] = self.generate_email(firstname, lastname)
-        
-        if not filled.get("username"):
-            filled["username"] = self.generate_username(firstname, lastname)
+        state = record.get("state") or record.get("country") or "Gujarat"
         
-        if not filled.get("password"):
-            filled["password"] = self.generate_password()
-        
-        if not filled.get("dateofbirth"):
-            filled["dateofbirth"] = self.generate_date_of_birth()
-        
-        if not filled.get("phonenumber"):
-            filled["phonenumber"] = self.generate_phone_number()
-        
-        if not filled.get("firstname"):
-            filled["firstname"] = self.fake.first_name()
-        
-        if not filled.get("lastname"):
-            filled["lastname"] = self.fake.last_name()
-        
-        if not filled.get("country"):
-            filled["country"] = "India"
-        
-        if not filled.get("place_of_birth"):
-            filled["place_of_birth"] = self.generate_place_of_birth(state)
-        
-        if not filled.get("residential_address"):
-            filled["residential_address"] = self.generate_address(city, state)
-        
-        if not filled.get("city"):
-            filled["city"] = self.generate_city(state)
-        
-        if not filled.get("postal_code"):
-            filled["postal_code"] = self.generate_postal_code(state)
-        
-        if not filled.get("occupation_industry"):
-            filled["occupation_industry"] = self.generate_occupation_industry()
-        
-        if not filled.get("occupation_field"):
-            filled["occupation_field"] = self.generate_occupation_field()
-        
-        if not filled.get("occupation_experience"):
-            filled["occupation_experience"] = self.generate_occupation_experience()
+        # Generate only the missing fields
+        return record | {
+            key: generate(self, record, state, draw)
+            for key, generate in self._FIELD_GENERATORS.items()
+            if key in missing
+        }
+    
+    def fill_missing_fields_batch(self, records: List[Dict]) -> List[Dict]:
+        """
+        Fill missing fields in a batch of records
         
-        return filled
+        Same rules as fill_missing_fields, but the uniforms behind every random
+        choice in the batch come from one NumPy call instead of one
+        random.random() call each. Faker is kept for names, streets and fallbacks.
+        """
+        if not records:
+            return []
+        draws = np.random.default_rng().random(len(records) * self._MAX_DRAWS)
+        draw = iter(draws.tolist()).__next__
+        return [self.fill_missing_fields(record, draw) for record in records]
 
 
 # Convenience function
-def fill_missing_data(records: list[Dict]) -> list[Dict]:
+def fill_missing_data(records: List[Dict]) -> List[Dict]:
     """Fill missing data in multiple records"""
-    generator = DataGenerator()
-    return [generator.fill_missing_fields(record) for record in records]
+    return DataGenerator().fill_missing_fields_batch(records)
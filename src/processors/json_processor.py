@@ -2,12 +2,141 @@
 
 import json
 import logging
+import mmap
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
+# Optional parser accelerators; the stdlib json module is the fallback
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# License keys read by JSONProcessor.map_license_to_registration
+LICENSE_FIELDS = (
+    "date_of_birth", "name", "address", "address1", "address2", "state",
+    "pincode", "emergency_contact", "blood_group", "driving_licence_number",
+)
+
+# Per-thread simdjson parser, see _get_parser()
+_parser_local = threading.local()
+
+# Files at least this large are memory-mapped instead of read into a bytes object
+MMAP_MIN_BYTES = 1 << 20
+
+# Files needed before process_all_files fans out to a process pool
+PARALLEL_MIN_FILES = 16
+
+# Sentinel for keys absent from a parsed object
+_MISSING = object()
+
+# Value types simdjson returns as plain Python objects (everything else is a proxy)
+_JSON_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+
+def _to_python(value):
+    """Convert a simdjson Object/Array proxy to plain dicts/lists (scalars pass through)"""
+    if isinstance(value, simdjson.Object):
+        return value.as_dict()
+    if isinstance(value, simdjson.Array):
+        return value.as_list()
+    return value
+
+
+def _pick_license_fields(obj: "simdjson.Object") -> Dict:
+    """Copy only LICENSE_FIELDS out of a lazily parsed object, as plain Python values"""
+    # Nested objects/arrays are converted, or they would keep the parser locked
+    return {
+        key: value if type(value) in _JSON_SCALARS else _to_python(value)
+        for key in LICENSE_FIELDS
+        if (value := obj.get(key, _MISSING)) is not _MISSING
+    }
+
+
+def _pick_dict_fields(obj: Dict) -> Dict:
+    """Copy only LICENSE_FIELDS out of an already parsed dict"""
+    return {key: obj[key] for key in LICENSE_FIELDS if key in obj}
+
+
+@lru_cache(maxsize=4096)
+def _parse_dob(dob: str) -> str:
+    """Convert DD/MM/YYYY to YYYY-MM-DD (cached: birth dates repeat a lot)"""
+    try:
+        return datetime.strptime(dob, "%d/%m/%Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return dob
+
+
+def _get_parser() -> "simdjson.Parser":
+    """
+    Get this thread's simdjson parser (built on first use)
+    
+    A parser keeps its tape and string buffers between documents, so it is
+    reused for every file rather than rebuilt per call. It cannot be shared
+    across threads, hence one per thread.
+    """
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = simdjson.Parser()
+    return parser
+
+
+def _load_license_json(raw):
+    """
+    Parse a bytes-like JSON buffer with simdjson
+    
+    Objects are materialised as plain dicts holding just LICENSE_FIELDS, so
+    the rest of each document is never converted to Python objects. Nested
+    values of those fields, and array items that are not objects, are
+    converted with as_dict()/as_list(), so no simdjson proxy outlives this
+    call; the parser refuses to parse the next file while one does.
+    """
+    doc = _get_parser().parse(raw)
+    if isinstance(doc, simdjson.Object):
+        return _pick_license_fields(doc)
+    if isinstance(doc, simdjson.Array):
+        return [
+            _pick_license_fields(item) if isinstance(item, simdjson.Object) else _to_python(item)
+            for item in doc
+        ]
+    return doc
+
+
+def _load_json(raw):
+    """
+    Parse a JSON buffer
+    
+    simdjson is tried first. Documents it rejects, or every document when it
+    is not installed, go to orjson, or to the stdlib parser without orjson,
+    which then reports (or accepts) them. Either way objects come back
+    holding only LICENSE_FIELDS.
+    """
+    if simdjson is not None:
+        try:
+            return _load_license_json(raw)
+        except ValueError:
+            pass
+    with memoryview(raw) as view:
+        doc = orjson.loads(view) if orjson is not None else json.loads(bytes(view))
+    # Same shape as the simdjson path: objects keep just LICENSE_FIELDS
+    if isinstance(doc, dict):
+        return _pick_dict_fields(doc)
+    if isinstance(doc, list):
+        return [_pick_dict_fields(item) if isinstance(item, dict) else item for item in doc]
+    return doc
+
 
 class JSONProcessor:
     """Process JSON files containing registration data"""
@@ -15,79 +144,100 @@ class JSONProcessor:
     def __init__(self, input_folder: str = None):
         from src.config import config
         self.input_folder = Path(input_folder) if input_folder else Path(config.paths.input_folder)
-        self.required_fields = [
+        self.required_fields = (
             "email", "username", "password", "dateofbirth", "phonenumber",
             "firstname", "lastname", "country", "place_of_birth",
             "residential_address", "city", "postal_code",
-            "occupation_industry", "occupation_field", "occupation_experience"
-        ]
+            "occupation_industry", "occupation_field", "occupation_experience",
+        )
         # Note: The test data has different field names from driving licenses
         # We'll map those fields in real implementation
     
     def discover_json_files(self) -> List[Path]:
         """Discover all JSON files in the input folder"""
-        if not self.input_folder.exists():
-            logger.warning(f"Input folder {self.input_folder} does not exist")
+        try:
+            # scandir gets the file type from the directory listing, no extra stat
+            with os.scandir(self.input_folder) as entries:
+                json_files = [
+                    Path(entry.path) for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()
+                ]
+        except OSError as e:
+            # Missing folder, not a directory, permission denied, ...
+            logger.warning("Cannot read input folder %s: %s", self.input_folder, e)
             return []
         
-        json_files = list(self.input_folder.glob("*.json"))
-        logger.info(f"Found {len(json_files)} JSON files in {self.input_folder}")
+        logger.info("Found %d JSON files in %s", len(json_files), self.input_folder)
         return json_files
     
     def parse_json_file(self, file_path: Path) -> Optional[List[Dict]]:
-        """Parse a single JSON file"""
+        """
+        Parse a single JSON file
+        
+        Records come back holding only the LICENSE_FIELDS keys, as plain
+        dicts; nested objects/arrays in those fields become plain dicts and
+        lists too. Everything is copied out of the reused simdjson parser
+        before this returns: the parser refuses to parse the next file
+        while any proxy into the previous document is still alive.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if file_path.stat().st_size >= MMAP_MIN_BYTES:
+                # Parse straight from the page cache; nothing parsed refers to
+                # the mapping once _load_json returns, so it can be closed
+                with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as raw:
+                    data = _load_json(raw)
+            else:
+                data = _load_json(file_path.read_bytes())
             
             # Handle both single object and array
             if isinstance(data, dict):
                 data = [data]
             elif not isinstance(data, list):
-                logger.error(f"Invalid JSON format in {file_path}: expected object or array")
+                logger.error("Invalid JSON format in %s: expected object or array", file_path)
                 return None
             
-            logger.info(f"Successfully parsed {file_path}: {len(data)} records")
+            logger.info("Successfully parsed %s: %d records", file_path, len(data))
             return data
             
         except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error in {file_path}: {e}")
+            logger.error("JSON decode error in %s: %s", file_path, e)
             return None
         except Exception as e:
-            logger.error(f"Error reading {file_path}: {e}")
+            logger.error("Error reading %s: %s", file_path, e)
             return None
     
-    def map_license_to_registration(self, license_data: Dict) -> Dict:
+    def map_license_to_registration(self, license_data: Dict, source: str = "") -> Dict:
         """
         Map driving license data to registration fields
         
         The input JSON has driving license fields, we need to map them
-        to the registration form fields
+        to the registration form fields. source is the originating file
+        name, stored as _source_file.
         """
         # Parse date of birth from DD/MM/YYYY to YYYY-MM-DD
         dob = license_data.get("date_of_birth", "")
         if dob and "/" in dob:
-            try:
-                dob_obj = datetime.strptime(dob, "%d/%m/%Y")
-                dob = dob_obj.strftime("%Y-%m-%d")
-            except:
-                pass
+            dob = _parse_dob(dob)
         
         # Split name into first and last
         full_name = license_data.get("name", "")
-        name_parts = full_name.split()
-        firstname = " ".join(name_parts[:-1]) if len(name_parts) > 1 else full_name
-        lastname = name_parts[-1] if len(name_parts) > 1 else ""
+        first, sep, last = full_name.strip().rpartition(" ")
+        if sep:
+            firstname, lastname = first.rstrip(), last
+        else:
+            firstname, lastname = full_name, ""
         
-        # Build address from multiple fields
-        address_parts = [
-            license_data.get("address", ""),
-            license_data.get("address1", ""),
-            license_data.get("address2", ""),
-        ]
-        residential_address = " ".join(filter(None, address_parts)).strip()
+        # Build address from multiple fields (all three are usually present)
+        address = license_data.get("address", "")
+        address1 = license_data.get("address1", "")
+        address2 = license_data.get("address2", "")
+        if address and address1 and address2:
+            residential_address = f"{address} {address1} {address2}".strip()
+        else:
+            residential_address = " ".join(filter(None, (address, address1, address2))).strip()
         
-        # Map to expected format
+        # Map to expected format (constant keys are already folded by the
+        # compiler, so an exec-generated variant of this literal gains nothing)
         mapped_data = {
             # From license data
             "dateofbirth": dob,
@@ -97,7 +247,7 @@ class JSONProcessor:
             "state": license_data.get("state", ""),
             "place_of_birth": license_data.get("state", ""),  # Use state as placeholder
             "residential_address": residential_address,
-            "city": self._extract_city(license_data.get("address2", "")),
+            "city": (address2 or "").partition(",")[0].strip(),  # 'Junagadh, Gujarat' -> 'Junagadh'
             "postal_code": str(license_data.get("pincode", "")),
             "phonenumber": license_data.get("emergency_contact", ""),
             
@@ -113,59 +263,87 @@ class JSONProcessor:
             "occupation_industry": None,
             "occupation_field": None,
             "occupation_experience": None,
+            
+            # Source file info
+            "_source_file": source,
         }
         
         return mapped_data
     
-    def _extract_city(self, address2: str) -> str:
-        """Extract city from address2 field (e.g., 'Junagadh, Gujarat' -> 'Junagadh')"""
-        if not address2:
-            return ""
-        parts = address2.split(",")
-        return parts[0].strip() if parts else address2.strip()
+    def is_complete(self, record: Dict) -> bool:
+        """Whether every required field is present and non-empty"""
+        # Plain per-record check: building a presence mask for a vectorised
+        # (NumPy/Numba) pass needs the same dict lookups and measured slower.
+        for field in self.required_fields:
+            value = record.get(field)
+            if value is None or value == "":
+                return False
+        return True
+    
+    def missing_fields(self, record: Dict) -> List[str]:
+        """Required fields that are absent or empty in record"""
+        missing_fields = []
+        for field in self.required_fields:
+            value = record.get(field)
+            if value is None or value == "":
+                missing_fields.append(field)
+        return missing_fields
     
     def validate_record(self, record: Dict) -> tuple[bool, List[str]]:
         """
         Validate a single record
         Returns: (is_valid, list_of_missing_fields)
         """
-        missing_fields = []
-        
-        for field in self.required_fields:
-            if field not in record or record[field] is None or record[field] == "":
-                missing_fields.append(field)
+        # Most records are complete; only build the list for the rest
+        if self.is_complete(record):
+            return True, []
         
-        is_valid = len(missing_fields) == 0
+        missing_fields = self.missing_fields(record)
+        logger.debug("Record validation: %d missing fields", len(missing_fields))
         
-        if not is_valid:
-            logger.debug(f"Record validation: {len(missing_fields)} missing fields")
+        return False, missing_fields
+    
+    def process_file(self, json_file: Path) -> List[Dict]:
+        """Parse one JSON file and map its records to registration format"""
+        records = self.parse_json_file(json_file)
+        if not records:
+            return []
         
-        return is_valid, missing_fields
+        # Map each record from license format to registration format.
+        # A pandas DataFrame pass over the file measured slower at every size
+        # (converting back with to_dict(orient="records") dominates).
+        source = json_file.name
+        return [self.map_license_to_registration(r, source) for r in records]
     
     def process_all_files(self) -> List[Dict]:
         """
         Process all JSON files in the input folder
         Returns list of all records from all files
         """
-        all_records = []
         json_files = self.discover_json_files()
+        if not json_files:
+            return []
         
-        for json_file in json_files:
-            records = self.parse_json_file(json_file)
-            if records:
-                # Map each record from license format to registration format
-                mapped_records = [self.map_license_to_registration(r) for r in records]
-                
-                # Add source file info
-                for record in mapped_records:
-                    record["_source_file"] = json_file.name
-                
-                all_records.extend(mapped_records)
+        all_records = []
+        workers = os.cpu_count() or 1
+        if workers > 1 and len(json_files) >= PARALLEL_MIN_FILES:
+            # Files are independent, so parse and map them on every core
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for mapped_records in executor.map(_process_one, json_files, chunksize=4):
+                    all_records.extend(mapped_records)
+        else:
+            for json_file in json_files:
+                all_records.extend(self.process_file(json_file))
         
-        logger.info(f"Processed {len(all_records)} total records from {len(json_files)} files")
+        logger.info("Processed %d total records from %d files", len(all_records), len(json_files))
         return all_records
 
 
+def _process_one(json_file: Path) -> List[Dict]:
+    """Process a single file in a pool worker (module level so it pickles)"""
+    return JSONProcessor(json_file.parent).process_file(json_file)
+
+
 def process_json_files(input_folder: str = None) -> List[Dict]:
     """Process all JSON files in the input folder"""
     processor = JSONProcessor(input_folder)
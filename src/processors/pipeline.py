@@ -43,7 +43,7 @@ class DataPipeline:
         # Step 1: Parse JSON files
         logger.info("Step 1: Parsing JSON files...")
         records = self.json_processor.process_all_files()
-        logger.info(f"✓ Parsed {len(records)} records")
+        logger.info("✓ Parsed %d records", len(records))
         
         if not records:
             logger.error("No records found to process")
@@ -51,17 +51,13 @@ class DataPipeline:
         
         # Step 2: Fill missing data
         logger.info("Step 2: Filling missing data...")
-        filled_records = []
-        for idx, record in enumerate(records, 1):
-            logger.debug(f"Processing record {idx}/{len(records)}")
-            filled = self.data_generator.fill_missing_fields(record)
-            filled_records.append(filled)
-        logger.info(f"✓ Filled missing data for {len(filled_records)} records")
+        filled_records = self.data_generator.fill_missing_fields_batch(records)
+        logger.info("✓ Filled missing data for %d records", len(filled_records))
         
         # Step 3: Generate Excel
         logger.info("Step 3: Generating Excel file...")
         excel_path = self.excel_generator.create_excel(filled_records, output_filename)
-        logger.info(f"✓ Excel file created: {excel_path}")
+        logger.info("✓ Excel file created: %s", excel_path)
         
         logger.info("=" * 60)
         logger.info("Pipeline completed successfully!")
@@ -5,15 +5,29 @@ import asyncio
 from typing import Dict
 from uuid import UUID
 
+from src.automation.browser_manager import BrowserPool
 from src.automation.registration_workflow import run_single_registration
-from src.database.crud import update_job_status, create_job_log
-from src.database.models import JobStatus
+from src.database.crud import update_job_status, update_job_verification, create_job_log
+from src.database.models import JobStatus, VerificationStatus
 from src.database.database import get_db_context
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+async def _run_registration(job_id: UUID, user_data: Dict, upload_folder: str) -> Dict:
+    """Run the workflow, then shut the shared browser down before the loop closes"""
+    try:
+        return await run_single_registration(
+            job_id=job_id,
+            user_data=user_data,
+            headless=settings.headless,
+            upload_folder=upload_folder,
+        )
+    finally:
+        await BrowserPool.shutdown()
+
+
 def process_registration_job(
     job_id: str,
     user_data: Dict,
@@ -39,47 +53,43 @@ def process_registration_job(
     logger.info(f"WORKER: Processing registration job {job_id}")
     logger.info("=" * 80)
     
-    # Update status to IN_PROGRESS
+    # Update status to RUNNING (writes commit together on context exit)
     with get_db_context() as db:
-        update_job_status(db, job_uuid, JobStatus.IN_PROGRESS)
+        update_job_status(db, job_uuid, JobStatus.RUNNING, autocommit=False)
         create_job_log(
             db,
             job_id=job_uuid,
             step_name="WORKER_START",
+            action="Worker started processing job",
             status="SUCCESS",
-            message="Worker started processing job",
+            autocommit=False,
         )
     
     try:
         # Run the async registration workflow
-        result = asyncio.run(
-            run_single_registration(
-                job_id=job_uuid,
-                user_data=user_data,
-                headless=settings.headless,
-                upload_folder=upload_folder,
-            )
-        )
+        result = asyncio.run(_run_registration(job_uuid, user_data, upload_folder))
         
         # Update database based on result
         with get_db_context() as db:
             if result["success"]:
                 # Success
-                update_job_status(
+                update_job_status(db, job_uuid, JobStatus.COMPLETED, autocommit=False)
+                update_job_verification(
                     db,
                     job_uuid,
-                    JobStatus.COMPLETED,
-                    verification_status=result["verification_status"],
+                    VerificationStatus(result["verification_status"]),
                     screenshot_path=result["screenshot_path"],
+                    autocommit=False,
                 )
                 
                 create_job_log(
                     db,
                     job_id=job_uuid,
                     step_name="REGISTRATION_COMPLETE",
+                    action=f"Registration completed. Status: {result['verification_status']}",
                     status="SUCCESS",
-                    message=f"Registration completed. Status: {result['verification_status']}",
-                    details=result,
+                    extra_data=result,
+                    autocommit=False,
                 )
                 
                 logger.info(f"✅ Job {job_id} completed successfully")
@@ -90,16 +100,19 @@ def process_registration_job(
                     job_uuid,
                     JobStatus.FAILED,
                     error_message=result.get("error"),
-                    screenshot_path=result.get("screenshot_path"),
+                    autocommit=False,
                 )
                 
+                # The error screenshot path is kept in the log's extra_data
                 create_job_log(
                     db,
                     job_id=job_uuid,
                     step_name="REGISTRATION_FAILED",
+                    action="Registration failed",
                     status="FAILED",
-                    message=f"Registration failed: {result.get('error')}",
-                    details=result,
+                    error_message=result.get("error"),
+                    extra_data=result,
+                    autocommit=False,
                 )
                 
                 logger.error(f"❌ Job {job_id} failed: {result.get('error')}")
@@ -116,14 +129,17 @@ def process_registration_job(
                 job_uuid,
                 JobStatus.FAILED,
                 error_message=str(e),
+                autocommit=False,
             )
             
             create_job_log(
                 db,
                 job_id=job_uuid,
                 step_name="WORKER_ERROR",
+                action="Worker error",
                 status="FAILED",
-                message=f"Worker error: {str(e)}",
+                error_message=str(e),
+                autocommit=False,
             )
         
         # Re-raise so RQ marks job as failed